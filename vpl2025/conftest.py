@@ -0,0 +1 @@
+# Lets tests import the app's modules (utils.*) the same way the pages do
@@ -1,102 +1,166 @@
 import streamlit as st
 import pandas as pd
 from utils.auth import check_authentication
-from utils.constants import FIXTURES_DATA, TEAMS_DATA
-from utils.data_manager import get_performances, save_performance
-from utils.scoring import calculate_total_player_points
+from utils.player_catalog import get_team_players
+from utils.fixtures_store import get_fixtures
+from utils.data_manager import get_performances, get_performance_version, get_performance_file_version, get_performance_changes, get_match_performance_map, get_contests
+from utils.projections import project_match_points, project_contest_totals
+from utils.instrumentation import page_run, section
 
 st.set_page_config(page_title="Live Scoring", page_icon="⚡", layout="wide")
-
-if not check_authentication():
-    st.stop()
-
-st.title("⚡ Live Scoring")
-
-# Live matches
-live_matches = [f for f in FIXTURES_DATA if f['status'] == 'live']
-upcoming_matches = [f for f in FIXTURES_DATA if f['status'] == 'upcoming']
-
-if live_matches:
-    st.markdown("### 🔴 Live Matches")
+with page_run("Live"):
+    if not check_authentication():
+        st.stop()
     
-    for match in live_matches:
-        with st.expander(f"🏏 LIVE: {match['teams'][0]} vs {match['teams'][1]} - {match['time']}"):
-            # Get performances for this match
-            performances = get_performances(match['match_id'])
-            
-            if not performances.empty:
-                st.subheader("Current Performances")
-                
-                # Display performances in a nice format
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.markdown(f"**{match['teams'][0]}**")
-                    team1_players = TEAMS_DATA.get(match['teams'][0], {}).get('players', [])
-                    
-                    for player in team1_players:
-                        player_perf = performances[performances['player_name'] == player['name']]
-                        if not player_perf.empty:
-                            perf = player_perf.iloc[0]
-                            st.write(f"**{player['name']}**: {perf['runs']} runs, {perf['wickets']} wickets - {perf['total_points']} pts")
-                        else:
-                            st.write(f"**{player['name']}**: No performance data")
-                
-                with col2:
-                    st.markdown(f"**{match['teams'][1]}**")
-                    team2_players = TEAMS_DATA.get(match['teams'][1], {}).get('players', [])
-                    
-                    for player in team2_players:
-                        player_perf = performances[performances['player_name'] == player['name']]
-                        if not player_perf.empty:
-                            perf = player_perf.iloc[0]
-                            st.write(f"**{player['name']}**: {perf['runs']} runs, {perf['wickets']} wickets - {perf['total_points']} pts")
-                        else:
-                            st.write(f"**{player['name']}**: No performance data")
+    st.title("⚡ Live Scoring")
+    
+    LIVE_REFRESH_SECONDS = 5
+    
+    def sync_match_performances(match_id):
+        """Bring this viewer's cached performances for a match up to date"""
+        cache = st.session_state.setdefault('live_performances', {})
+        entry = cache.get(match_id)
+        
+        # Both cursors are taken before reading so no write is missed
+        file_version = get_performance_file_version(match_id)
+        changes = None
+        if entry is not None:
+            version, changes = get_performance_changes(match_id, entry['version'], entry['file_version'])
+        
+        if changes is None:
+            # First view, stale cursor or a write from another process: reload fully
+            version = get_performance_version()
+            entry = {'version': version, 'file_version': file_version, 'rows': dict(get_match_performance_map(match_id)), 'rows_version': 0}
+        else:
+            for row in changes:
+                entry['rows'][row['player_name']] = row
+            if changes:
+                entry['rows_version'] += 1
+            entry['version'] = version
+            entry['file_version'] = file_version
+        
+        cache[match_id] = entry
+        return entry['rows']
+    
+    def render_team_performances(team_name, rows):
+        """Render one line per squad player from cached performance rows"""
+        st.markdown(f"**{team_name}**")
+        for player in get_team_players(team_name):
+            perf = rows.get(player['name'])
+            if perf is not None:
+                st.write(f"**{player['name']}**: {perf['runs']} runs, {perf['wickets']} wickets - {perf['total_points']} pts")
             else:
-                st.info("No performance data available yet")
-                
-            # Admin can update scores
-            if st.session_state.is_admin:
-                if st.button(f"Update Scores", key=f"update_{match['match_id']}"):
-                    st.switch_page("pages/7_⚙️_Admin.py")
-
-if upcoming_matches:
-    st.markdown("### 📅 Upcoming Matches")
+                st.write(f"**{player['name']}**: No performance data")
     
-    for match in upcoming_matches[:3]:  # Show next 3 matches
-        with st.expander(f"🏏 {match['teams'][0]} vs {match['teams'][1]} - {match['time']}"):
+    def render_projected_leaders(match, rows):
+        """Render projected top players and contest leaders for a live match"""
+        entry = st.session_state['live_performances'][match['match_id']]
+        
+        # Recompute projections only when this match's performances changed
+        if entry.get('projection_version') != entry['rows_version']:
+            performances = pd.DataFrame(list(rows.values()))
+            entry['player_projections'] = project_match_points(match['match_id'], performances)
+            entry['team_projections'] = project_contest_totals(match['match_id'], performances)
+            entry['projection_version'] = entry['rows_version']
+        
+        st.subheader("📈 Projected Leaders")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("**Top Players (projected)**")
+            top_players = entry['player_projections'].nlargest(5, 'projected_points')
+            for i, (_, player) in enumerate(top_players.iterrows(), 1):
+                st.write(f"{i}. **{player['player_name']}** - {player['projected_points']:.0f} pts (now {player['current_points']:.0f})")
+        
+        with col2:
+            team_projections = entry['team_projections']
+            if not team_projections.empty:
+                contest_names = get_contests().set_index('contest_id')['name']
+                for contest_id, contest_teams in team_projections.groupby('contest_id'):
+                    st.markdown(f"**{contest_names.get(contest_id, 'Contest')}**")
+                    for _, team in contest_teams.head(3).iterrows():
+                        st.write(f"#{team['projected_rank']} {team['username']} - {team['team_name']} - {team['projected_points']:.0f} pts projected")
+            else:
+                st.info("No contest teams for this match yet")
+    
+    @page_run("Live:live_match")
+    def render_live_match(match):
+        """Render current performances for a live match"""
+        with section("sync performances"):
+            rows = sync_match_performances(match['match_id'])
+        
+        if rows:
+            st.subheader("Current Performances")
+            
+            # Display performances in a nice format
             col1, col2 = st.columns(2)
             
             with col1:
-                st.write(f"**Time:** {match['time']}")
-                st.write(f"**Day:** {match['day']}")
+                render_team_performances(match['teams'][0], rows)
             
             with col2:
-                st.write(f"**Status:** {match['status'].title()}")
-                if st.button(f"Create Contest", key=f"contest_{match['match_id']}"):
-                    st.switch_page("pages/4_🏆_Contests.py")
-
-# If no live matches
-if not live_matches:
-    st.info("No live matches at the moment")
+                render_team_performances(match['teams'][1], rows)
+            
+            render_projected_leaders(match, rows)
+        else:
+            st.info("No performance data available yet")
     
-    # Show recent completed matches
-    completed_matches = [f for f in FIXTURES_DATA if f['status'] == 'completed']
+    # Live matches
+    live_matches = get_fixtures('live')
+    upcoming_matches = get_fixtures('upcoming')
     
-    if completed_matches:
-        st.markdown("### 🏁 Recent Completed Matches")
+    if live_matches:
+        st.markdown("### 🔴 Live Matches")
         
-        for match in completed_matches[-3:]:  # Show last 3 completed matches
-            with st.expander(f"🏏 COMPLETED: {match['teams'][0]} vs {match['teams'][1]} - {match['time']}"):
-                # Get final performances
-                performances = get_performances(match['match_id'])
+        # Live mode reruns only the match panels, pulling just the changed rows
+        live_mode = st.toggle("Live mode (auto-refresh)", value=True)
+        live_match_panel = st.fragment(run_every=LIVE_REFRESH_SECONDS if live_mode else None)(render_live_match)
+        
+        for match in live_matches:
+            with st.expander(f"🏏 LIVE: {match['teams'][0]} vs {match['teams'][1]} - {match['time']}"):
+                live_match_panel(match)
                 
-                if not performances.empty:
-                    st.subheader("Final Performances")
-                    st.dataframe(performances[['player_name', 'team_name', 'runs', 'wickets', 'total_points']], use_container_width=True)
+                # Admin can update scores
+                if st.session_state.is_admin:
+                    if st.button(f"Update Scores", key=f"update_{match['match_id']}"):
+                        st.switch_page("pages/7_⚙️_Admin.py")
+    
+    if upcoming_matches:
+        st.markdown("### 📅 Upcoming Matches")
+        
+        for match in upcoming_matches[:3]:  # Show next 3 matches
+            with st.expander(f"🏏 {match['teams'][0]} vs {match['teams'][1]} - {match['time']}"):
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.write(f"**Time:** {match['time']}")
+                    st.write(f"**Day:** {match['day']}")
+                
+                with col2:
+                    st.write(f"**Status:** {match['status'].title()}")
+                    if st.button(f"Create Contest", key=f"contest_{match['match_id']}"):
+                        st.switch_page("pages/4_🏆_Contests.py")
+    
+    # If no live matches
+    if not live_matches:
+        st.info("No live matches at the moment")
+        
+        # Show recent completed matches
+        completed_matches = get_fixtures('completed')
+        
+        if completed_matches:
+            st.markdown("### 🏁 Recent Completed Matches")
+            
+            for match in completed_matches[-3:]:  # Show last 3 completed matches
+                with st.expander(f"🏏 COMPLETED: {match['teams'][0]} vs {match['teams'][1]} - {match['time']}"):
+                    # Get final performances
+                    performances = get_performances(match['match_id'])
                     
-                    if st.button(f"View Results", key=f"results_{match['match_id']}"):
-                        st.switch_page("pages/6_📊_Results.py")
-                else:
-                    st.info("No performance data available")
+                    if not performances.empty:
+                        st.subheader("Final Performances")
+                        st.dataframe(performances[['player_name', 'team_name', 'runs', 'wickets', 'total_points']], use_container_width=True)
+                        
+                        if st.button(f"View Results", key=f"results_{match['match_id']}"):
+                            st.switch_page("pages/6_📊_Results.py")
+                    else:
+                        st.info("No performance data available")
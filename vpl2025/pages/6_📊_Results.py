@@ -2,151 +2,205 @@ import streamlit as st
 import pandas as pd
 from utils.auth import check_authentication
 from utils.data_manager import get_contests, get_leaderboard, get_performances
-from utils.constants import FIXTURES_DATA
+from utils.fixtures_store import get_fixture
+from utils.snapshots import get_snapshot_count, get_biggest_climbers
+from utils.projections import project_contest_totals
+from utils.scoring import get_team_breakdown
+from utils.instrumentation import page_run, section
 
 st.set_page_config(page_title="Results", page_icon="📊", layout="wide")
-
-if not check_authentication():
-    st.stop()
-
-st.title("📊 Results & Leaderboards")
-
-# Get all contests
-contests_df = get_contests()
-
-if not contests_df.empty:
-    # Contest selection
-    contest_names = contests_df['name'].tolist()
-    selected_contest_name = st.selectbox("Select Contest", contest_names)
+with page_run("Results"):
+    TEAM_PAGE_SIZES = [25, 50, 100]
+    RANK_MEDALS = {1: "🥇 1st", 2: "🥈 2nd", 3: "🥉 3rd"}
     
-    if selected_contest_name:
-        contest_info = contests_df[contests_df['name'] == selected_contest_name].iloc[0]
-        
-        # Contest details
-        col1, col2, col3 = st.columns(3)
+    @st.fragment
+    @page_run("Results:team_details")
+    def render_team_details(leaderboard, match_id):
+        """Show one page of teams, with the selected team's player breakdown loaded on demand"""
+        contest_key = leaderboard['contest_id'].iloc[0]
         
+        col1, col2 = st.columns([1, 3])
         with col1:
-            st.metric("Entry Fee", f"₹{contest_info['entry_fee']}")
-        
+            page_size = st.selectbox("Teams per page", TEAM_PAGE_SIZES, key=f"team_page_size_{contest_key}")
+        page_count = max(1, -(-len(leaderboard) // page_size))
         with col2:
-            st.metric("Prize Pool", f"₹{contest_info['prize_pool']}")
+            page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, key=f"team_page_{contest_key}")
+        
+        # Only the current page is ever sent to the browser
+        page_teams = leaderboard.iloc[(page - 1) * page_size:page * page_size]
+        page_display = page_teams[['rank', 'username', 'team_name', 'captain', 'vice_captain', 'total_points']].copy()
+        page_display.columns = ['Rank', 'User', 'Team Name', 'Captain', 'Vice-Captain', 'Total Points']
         
-        with col3:
-            st.metric("Max Participants", contest_info['max_participants'])
+        selection = st.dataframe(
+            page_display,
+            use_container_width=True,
+            hide_index=True,
+            on_select="rerun",
+            selection_mode="single-row",
+            key=f"team_table_{contest_key}_{page}_{page_size}"
+        )
         
-        # Match details
-        match_info = next((f for f in FIXTURES_DATA if f['match_id'] == contest_info['match_id']), None)
-        if match_info:
-            st.info(f"Match: {match_info['teams'][0]} vs {match_info['teams'][1]} - {match_info['time']} ({match_info['day']})")
+        selected_rows = selection.selection.rows
+        if not selected_rows:
+            st.caption("Select a team to see its player breakdown")
+            return
         
-        # Leaderboard
-        st.markdown("### 🏆 Leaderboard")
+        team = page_teams.iloc[selected_rows[0]]
+        st.markdown(f"#### 🏏 {team['team_name']} - {team['username']} (Rank #{team['rank']})")
         
-        leaderboard = get_leaderboard(contest_info['contest_id'])
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            breakdown = get_team_breakdown(team['players'].split(','), team['captain'], team['vice_captain'], match_id)
+            st.dataframe(breakdown, use_container_width=True, hide_index=True)
+        with col2:
+            st.metric("Total Points", team['total_points'])
+            st.metric("Rank", f"#{team['rank']}")
+            st.write(f"**Created:** {team['created_at']}")
+    
+    if not check_authentication():
+        st.stop()
+    
+    st.title("📊 Results & Leaderboards")
+    
+    # Get all contests
+    contests_df = get_contests()
+    
+    if not contests_df.empty:
+        # Contest selection
+        contest_names = contests_df['name'].tolist()
+        selected_contest_name = st.selectbox("Select Contest", contest_names)
         
-        if not leaderboard.empty:
-            # Display leaderboard
-            leaderboard_display = leaderboard[['rank', 'username', 'team_name', 'total_points']].copy()
-            leaderboard_display.columns = ['Rank', 'User', 'Team Name', 'Total Points']
+        if selected_contest_name:
+            contest_info = contests_df[contests_df['name'] == selected_contest_name].iloc[0]
             
-            # Add medals for top 3
-            for i, row in leaderboard_display.iterrows():
-                if row['Rank'] == 1:
-                    leaderboard_display.loc[i, 'Rank'] = "🥇 1st"
-                elif row['Rank'] == 2:
-                    leaderboard_display.loc[i, 'Rank'] = "🥈 2nd"
-                elif row['Rank'] == 3:
-                    leaderboard_display.loc[i, 'Rank'] = "🥉 3rd"
-                else:
-                    leaderboard_display.loc[i, 'Rank'] = f"#{row['Rank']}"
+            # Contest details
+            col1, col2, col3 = st.columns(3)
             
-            st.dataframe(leaderboard_display, use_container_width=True)
+            with col1:
+                st.metric("Entry Fee", f"₹{contest_info['entry_fee']}")
             
-            # Team details
-            st.markdown("### 👥 Team Details")
+            with col2:
+                st.metric("Prize Pool", f"₹{contest_info['prize_pool']}")
             
-            for _, team in leaderboard.iterrows():
-                with st.expander(f"🏏 {team['team_name']} - {team['username']} (Rank #{team['rank']})"):
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.write("**Team Players (7):**")
-                        players = team['players'].split(',')
-                        for i, player in enumerate(players, 1):
-                            if player == team['captain']:
-                                st.write(f"{i}. 👑 {player} (Captain - 2x)")
-                            elif player == team['vice_captain']:
-                                st.write(f"{i}. 🔰 {player} (Vice-Captain - 1.5x)")
-                            else:
-                                st.write(f"{i}. ⚡ {player}")
-                    
-                    with col2:
-                        st.metric("Total Points", team['total_points'])
-                        st.metric("Rank", f"#{team['rank']}")
-                        st.write(f"**Created:** {team['created_at']}")
+            with col3:
+                st.metric("Max Participants", contest_info['max_participants'])
+            
+            # Match details
+            match_info = get_fixture(contest_info['match_id'])
+            if match_info:
+                st.info(f"Match: {match_info['teams'][0]} vs {match_info['teams'][1]} - {match_info['time']} ({match_info['day']})")
+            
+            # Leaderboard
+            st.markdown("### 🏆 Leaderboard")
+            
+            with section("leaderboard"):
+                leaderboard = get_leaderboard(contest_info['contest_id'])
             
-            # Match performances
-            if match_info and match_info['status'] == 'completed':
-                st.markdown("### 🎯 Match Performances")
+            if not leaderboard.empty:
+                # Display leaderboard
+                leaderboard_display = leaderboard[['rank', 'username', 'team_name', 'total_points']].copy()
+                leaderboard_display.columns = ['Rank', 'User', 'Team Name', 'Total Points']
                 
-                performances = get_performances(contest_info['match_id'])
+                # Add medals for top 3
+                leaderboard_display['Rank'] = leaderboard_display['Rank'].map(lambda rank: RANK_MEDALS.get(rank, f"#{rank}"))
                 
-                if not performances.empty:
-                    # Top performers
-                    top_performers = performances.nlargest(10, 'total_points')
+                st.dataframe(leaderboard_display, use_container_width=True)
+                
+                # Projected finish while the match is in progress
+                if match_info and match_info['status'] == 'live':
+                    with section("projections"):
+                        projections = project_contest_totals(contest_info['match_id'])
+                    if not projections.empty:
+                        projections = projections[projections['contest_id'] == contest_info['contest_id']]
                     
-                    st.subheader("🌟 Top Performers")
+                    if not projections.empty:
+                        st.markdown("### 🔮 Projected Leaders")
+                        projections_display = projections[['projected_rank', 'username', 'team_name', 'total_points', 'projected_points']].head(10).copy()
+                        projections_display['projected_points'] = projections_display['projected_points'].round(1)
+                        projections_display.columns = ['Projected Rank', 'User', 'Team Name', 'Current Points', 'Projected Points']
+                        st.dataframe(projections_display, use_container_width=True, hide_index=True)
+                
+                # Rank movement across live scoring snapshots
+                if get_snapshot_count(contest_info['contest_id']) > 1:
+                    with section("climbers"):
+                        climbers = get_biggest_climbers(contest_info['contest_id'])
+                    climbers = climbers[climbers['places_gained'] > 0]
                     
-                    for i, (_, player) in enumerate(top_performers.iterrows(), 1):
-                        with st.expander(f"#{i} {player['player_name']} - {player['total_points']} points"):
-                            col1, col2, col3 = st.columns(3)
-                            
-                            with col1:
-                                st.write("**Batting**")
-                                st.write(f"Runs: {player['runs']}")
-                                st.write(f"Balls: {player['balls_faced']}")
-                                st.write(f"4s: {player['fours']}")
-                                st.write(f"6s: {player['sixes']}")
-                            
-                            with col2:
-                                st.write("**Bowling**")
-                                st.write(f"Wickets: {player['wickets']}")
-                                st.write(f"Overs: {player['overs_bowled']}")
-                                st.write(f"Runs Given: {player['runs_conceded']}")
-                            
-                            with col3:
-                                st.write("**Fielding**")
-                                st.write(f"Catches: {player['catches']}")
-                                st.write(f"Stumpings: {player['stumpings']}")
-                                st.write(f"Run Outs: {player['run_outs']}")
+                    if not climbers.empty:
+                        st.markdown("### 📈 Biggest Climbers")
+                        climbers = climbers.merge(leaderboard[['team_id', 'username', 'team_name']], on='team_id', how='left')
+                        climbers_display = climbers[['username', 'team_name', 'start_rank', 'end_rank', 'places_gained']].copy()
+                        climbers_display.columns = ['User', 'Team Name', 'Start Rank', 'Current Rank', 'Places Gained']
+                        climbers_display.index = range(1, len(climbers_display) + 1)
+                        st.dataframe(climbers_display, use_container_width=True)
+                
+                # Team details
+                st.markdown("### 👥 Team Details")
+                
+                render_team_details(leaderboard, contest_info['match_id'])
+                
+                # Match performances
+                if match_info and match_info['status'] == 'completed':
+                    st.markdown("### 🎯 Match Performances")
                     
-                    # Full performance table
-                    st.subheader("📋 All Performances")
-                    st.dataframe(performances, use_container_width=True)
-                else:
-                    st.info("No performance data available")
-        else:
-            st.info("No teams have joined this contest yet")
-else:
-    st.info("No contests available")
-
-# Overall statistics
-st.markdown("### 📈 Overall Statistics")
-
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    total_contests = len(contests_df) if not contests_df.empty else 0
-    st.metric("Total Contests", total_contests)
-
-with col2:
-    active_contests = len(contests_df[contests_df['status'] == 'active']) if not contests_df.empty else 0
-    st.metric("Active Contests", active_contests)
-
-with col3:
-    completed_contests = len(contests_df[contests_df['status'] == 'completed']) if not contests_df.empty else 0
-    st.metric("Completed", completed_contests)
-
-with col4:
-    total_prize_pool = contests_df['prize_pool'].sum() if not contests_df.empty else 0
-    st.metric("Total Prize Pool", f"₹{total_prize_pool:,}")
+                    performances = get_performances(contest_info['match_id'])
+                    
+                    if not performances.empty:
+                        # Top performers
+                        top_performers = performances.nlargest(10, 'total_points')
+                        
+                        st.subheader("🌟 Top Performers")
+                        
+                        for i, (_, player) in enumerate(top_performers.iterrows(), 1):
+                            with st.expander(f"#{i} {player['player_name']} - {player['total_points']} points"):
+                                col1, col2, col3 = st.columns(3)
+                                
+                                with col1:
+                                    st.write("**Batting**")
+                                    st.write(f"Runs: {player['runs']}")
+                                    st.write(f"Balls: {player['balls_faced']}")
+                                    st.write(f"4s: {player['fours']}")
+                                    st.write(f"6s: {player['sixes']}")
+                                
+                                with col2:
+                                    st.write("**Bowling**")
+                                    st.write(f"Wickets: {player['wickets']}")
+                                    st.write(f"Overs: {player['overs_bowled']}")
+                                    st.write(f"Runs Given: {player['runs_conceded']}")
+                                
+                                with col3:
+                                    st.write("**Fielding**")
+                                    st.write(f"Catches: {player['catches']}")
+                                    st.write(f"Stumpings: {player['stumpings']}")
+                                    st.write(f"Run Outs: {player['run_outs']}")
+                        
+                        # Full performance table
+                        st.subheader("📋 All Performances")
+                        st.dataframe(performances, use_container_width=True)
+                    else:
+                        st.info("No performance data available")
+            else:
+                st.info("No teams have joined this contest yet")
+    else:
+        st.info("No contests available")
+    
+    # Overall statistics
+    st.markdown("### 📈 Overall Statistics")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        total_contests = len(contests_df) if not contests_df.empty else 0
+        st.metric("Total Contests", total_contests)
+    
+    with col2:
+        active_contests = len(contests_df[contests_df['status'] == 'active']) if not contests_df.empty else 0
+        st.metric("Active Contests", active_contests)
+    
+    with col3:
+        completed_contests = len(contests_df[contests_df['status'] == 'completed']) if not contests_df.empty else 0
+        st.metric("Completed", completed_contests)
+    
+    with col4:
+        total_prize_pool = contests_df['prize_pool'].sum() if not contests_df.empty else 0
+        st.metric("Total Prize Pool", f"₹{total_prize_pool:,}")
@@ -1,255 +1,263 @@
 import streamlit as st
-import pandas as pd
 from utils.auth import initialize_auth, check_authentication
-from utils.data_manager import get_contests, get_leaderboard
-from utils.constants import FIXTURES_DATA
+from utils.constants import PRIZE_DISTRIBUTION
+from utils.data_manager import get_contests, get_leaderboards, get_hall_of_fame, get_contest_results
+from utils.fixtures_store import get_fixture
+from utils.instrumentation import page_run
 
 st.set_page_config(page_title="Winners", page_icon="🏅", layout="wide")
 
-# Initialize authentication
-initialize_auth()
+PLACE_LABELS = ["🥇 **1st Place:**", "🥈 **2nd Place:**", "🥉 **3rd Place:**"]
 
-if not check_authentication():
-    st.stop()
-
-# Persistent logout button
-def show_logout_button():
-    if st.session_state.get('authenticated', False):
-        col1, col2 = st.columns([9, 1])
-        with col2:
-            if st.button("🚪 Logout", type="secondary", key="logout_winners"):
-                from utils.auth import logout
-                logout()
-
-show_logout_button()
-
-st.title("🏅 Contest Winners")
-st.subheader("Hall of Fame - VPL Fantasy League Champions")
-
-# Get all contests
-contests_df = get_contests()
-
-if not contests_df.empty:
-    # Filter completed contests
-    completed_contests = contests_df[contests_df['status'] == 'completed']
+with page_run("Winners"):
+    # Initialize authentication
+    initialize_auth()
+    
+    if not check_authentication():
+        st.stop()
     
-    if not completed_contests.empty:
-        st.markdown("### 🏆 Completed Contests")
+    # Persistent logout button
+    def show_logout_button():
+        if st.session_state.get('authenticated', False):
+            col1, col2 = st.columns([9, 1])
+            with col2:
+                if st.button("🚪 Logout", type="secondary", key="logout_winners"):
+                    from utils.auth import logout
+                    logout()
+    
+    show_logout_button()
+    
+    st.title("🏅 Contest Winners")
+    st.subheader("Hall of Fame - VPL Fantasy League Champions")
+    
+    # Get all contests
+    contests_df = get_contests()
+    
+    if not contests_df.empty:
+        # Build every contest leaderboard in one pass
+        leaderboards = get_leaderboards(contests_df['contest_id'].tolist())
         
-        # Display completed contests with winners
-        for idx, contest in completed_contests.iterrows():
-            match_info = next((f for f in FIXTURES_DATA if f['match_id'] == contest['match_id']), None)
+        # Filter completed contests
+        completed_contests = contests_df[contests_df['status'] == 'completed']
+        
+        if not completed_contests.empty:
+            st.markdown("### 🏆 Completed Contests")
             
-            if match_info:
-                st.markdown(f"#### {contest['name']}")
-                st.write(f"**Match:** {match_info['teams'][0]} vs {match_info['teams'][1]}")
-                st.write(f"**Prize Pool:** ₹{contest['prize_pool']}")
-                
-                # Get leaderboard for this contest
-                leaderboard = get_leaderboard(contest['contest_id'])
+            # Display completed contests with winners
+            for idx, contest in completed_contests.iterrows():
+                match_info = get_fixture(contest['match_id'])
                 
-                if not leaderboard.empty:
-                    # Display top 3 winners
-                    st.markdown("##### 🥇 Top 3 Winners:")
-                    
-                    top3 = leaderboard.head(3)
+                if match_info:
+                    st.markdown(f"#### {contest['name']}")
+                    st.write(f"**Match:** {match_info['teams'][0]} vs {match_info['teams'][1]}")
+                    st.write(f"**Prize Pool:** ₹{contest['prize_pool']}")
                     
-                    for i, (_, winner) in enumerate(top3.iterrows()):
-                        if i == 0:
-                            st.success(f"🥇 **1st Place:** {winner['username']} - Team: {winner['team_name']} - Points: {winner['total_points']}")
-                        elif i == 1:
-                            st.info(f"🥈 **2nd Place:** {winner['username']} - Team: {winner['team_name']} - Points: {winner['total_points']}")
-                        elif i == 2:
-                            st.warning(f"🥉 **3rd Place:** {winner['username']} - Team: {winner['team_name']} - Points: {winner['total_points']}")
+                    # Get leaderboard for this contest
+                    leaderboard = leaderboards[contest['contest_id']]
                     
-                    # Show full leaderboard in expander
-                    with st.expander("View Full Leaderboard"):
-                        # Create display dataframe
-                        display_df = leaderboard[['rank', 'username', 'team_name', 'total_points']].copy()
-                        display_df.columns = ['Rank', 'Username', 'Team Name', 'Total Points']
+                    if not leaderboard.empty:
+                        # Display top 3 winners
+                        st.markdown("##### 🥇 Top 3 Winners:")
                         
-                        # Add medals for top 3
-                        display_df.loc[display_df['Rank'] == 1, 'Rank'] = "🥇 1st"
-                        display_df.loc[display_df['Rank'] == 2, 'Rank'] = "🥈 2nd"
-                        display_df.loc[display_df['Rank'] == 3, 'Rank'] = "🥉 3rd"
+                        top3 = leaderboard.head(3)
                         
-                        st.dataframe(display_df, use_container_width=True, hide_index=True)
+                        # Tied teams share a rank, so the place comes from the rank
+                        for _, winner in top3.iterrows():
+                            if winner['rank'] == 1:
+                                st.success(f"🥇 **1st Place:** {winner['username']} - Team: {winner['team_name']} - Points: {winner['total_points']}")
+                            elif winner['rank'] == 2:
+                                st.info(f"🥈 **2nd Place:** {winner['username']} - Team: {winner['team_name']} - Points: {winner['total_points']}")
+                            elif winner['rank'] == 3:
+                                st.warning(f"🥉 **3rd Place:** {winner['username']} - Team: {winner['team_name']} - Points: {winner['total_points']}")
                         
-                        # Prize distribution
-                        st.markdown("##### 💰 Prize Distribution:")
-                        total_prize = contest['prize_pool']
-                        
-                        if len(leaderboard) >= 3:
-                            first_prize = total_prize * 0.5
-                            second_prize = total_prize * 0.3
-                            third_prize = total_prize * 0.2
+                        # Show full leaderboard in expander
+                        with st.expander("View Full Leaderboard"):
+                            # Create display dataframe
+                            display_df = leaderboard[['rank', 'username', 'team_name', 'total_points']].copy()
+                            display_df.columns = ['Rank', 'Username', 'Team Name', 'Total Points']
                             
-                            st.write(f"🥇 **1st Place:** ₹{first_prize:.0f}")
-                            st.write(f"🥈 **2nd Place:** ₹{second_prize:.0f}")
-                            st.write(f"🥉 **3rd Place:** ₹{third_prize:.0f}")
-                        elif len(leaderboard) == 2:
-                            first_prize = total_prize * 0.7
-                            second_prize = total_prize * 0.3
+                            # Add medals for top 3
+                            display_df.loc[display_df['Rank'] == 1, 'Rank'] = "🥇 1st"
+                            display_df.loc[display_df['Rank'] == 2, 'Rank'] = "🥈 2nd"
+                            display_df.loc[display_df['Rank'] == 3, 'Rank'] = "🥉 3rd"
                             
-                            st.write(f"🥇 **1st Place:** ₹{first_prize:.0f}")
-                            st.write(f"🥈 **2nd Place:** ₹{second_prize:.0f}")
-                        elif len(leaderboard) == 1:
-                            st.write(f"🥇 **Winner takes all:** ₹{total_prize:.0f}")
-                else:
-                    st.info("No participants in this contest")
-                
-                st.markdown("---")
-    
-    # Show live contests
-    live_contests = contests_df[contests_df['status'] == 'live']
-    
-    if not live_contests.empty:
-        st.markdown("### 🔴 Live Contests")
+                            st.dataframe(display_df, use_container_width=True, hide_index=True)
+                            
+                            # Prize distribution as paid out, tied teams splitting their places
+                            st.markdown("##### 💰 Prize Distribution:")
+                            results = get_contest_results(contest['contest_id'])
+                            paid = results[results['prize_amount'] > 0] if not results.empty else results
+                            if paid.empty:
+                                st.info("Prizes will appear once results are recorded")
+                            elif len(results) == 1:
+                                st.write(f"🥇 **Winner takes all:** {paid.iloc[0]['username']} - ₹{paid.iloc[0]['prize_amount']:.0f}")
+                            else:
+                                for _, result in paid.iterrows():
+                                    rank = int(result['rank'])
+                                    label = PLACE_LABELS[rank - 1] if rank <= len(PLACE_LABELS) else f"**#{rank}:**"
+                                    st.write(f"{label} {result['username']} - ₹{result['prize_amount']:.0f}")
+                    else:
+                        st.info("No participants in this contest")
+                    
+                    st.markdown("---")
+        
+        # Show live contests
+        live_contests = contests_df[contests_df['status'] == 'live']
         
-        for idx, contest in live_contests.iterrows():
-            match_info = next((f for f in FIXTURES_DATA if f['match_id'] == contest['match_id']), None)
+        if not live_contests.empty:
+            st.markdown("### 🔴 Live Contests")
             
-            if match_info:
-                st.markdown(f"#### {contest['name']} - LIVE")
-                st.write(f"**Match:** {match_info['teams'][0]} vs {match_info['teams'][1]}")
+            for idx, contest in live_contests.iterrows():
+                match_info = get_fixture(contest['match_id'])
                 
-                # Get current standings
-                leaderboard = get_leaderboard(contest['contest_id'])
-                
-                if not leaderboard.empty:
-                    st.markdown("##### 📊 Current Standings:")
+                if match_info:
+                    st.markdown(f"#### {contest['name']} - LIVE")
+                    st.write(f"**Match:** {match_info['teams'][0]} vs {match_info['teams'][1]}")
                     
-                    # Show top 5 current leaders
-                    top5 = leaderboard.head(5)
+                    # Get current standings
+                    leaderboard = leaderboards[contest['contest_id']]
                     
-                    for i, (_, leader) in enumerate(top5.iterrows()):
-                        if i == 0:
-                            st.success(f"🔥 **Leading:** {leader['username']} - {leader['team_name']} - {leader['total_points']} pts")
-                        else:
-                            st.write(f"**{i+1}.** {leader['username']} - {leader['team_name']} - {leader['total_points']} pts")
+                    if not leaderboard.empty:
+                        st.markdown("##### 📊 Current Standings:")
+                        
+                        # Show top 5 current leaders
+                        top5 = leaderboard.head(5)
+                        
+                        for i, (_, leader) in enumerate(top5.iterrows()):
+                            if i == 0:
+                                st.success(f"🔥 **Leading:** {leader['username']} - {leader['team_name']} - {leader['total_points']} pts")
+                            else:
+                                st.write(f"**{i+1}.** {leader['username']} - {leader['team_name']} - {leader['total_points']} pts")
+                        
+                        with st.expander("View Full Live Standings"):
+                            display_df = leaderboard[['rank', 'username', 'team_name', 'total_points']].copy()
+                            display_df.columns = ['Rank', 'Username', 'Team Name', 'Total Points']
+                            st.dataframe(display_df, use_container_width=True, hide_index=True)
+                    else:
+                        st.info("No participants in this contest")
                     
-                    with st.expander("View Full Live Standings"):
-                        display_df = leaderboard[['rank', 'username', 'team_name', 'total_points']].copy()
-                        display_df.columns = ['Rank', 'Username', 'Team Name', 'Total Points']
-                        st.dataframe(display_df, use_container_width=True, hide_index=True)
-                else:
-                    st.info("No participants in this contest")
+                    st.markdown("---")
+        
+        # Show upcoming contests
+        upcoming_contests = contests_df[contests_df['status'] == 'active']
+        
+        if not upcoming_contests.empty:
+            st.markdown("### 📅 Upcoming Contests")
+            
+            for idx, contest in upcoming_contests.iterrows():
+                match_info = get_fixture(contest['match_id'])
                 
-                st.markdown("---")
-    
-    # Show upcoming contests
-    upcoming_contests = contests_df[contests_df['status'] == 'active']
-    
-    if not upcoming_contests.empty:
-        st.markdown("### 📅 Upcoming Contests")
+                if match_info:
+                    st.markdown(f"#### {contest['name']}")
+                    st.write(f"**Match:** {match_info['teams'][0]} vs {match_info['teams'][1]}")
+                    st.write(f"**Entry Fee:** ₹{contest['entry_fee']} | **Prize Pool:** ₹{contest['prize_pool']}")
+                    
+                    # Get current participants
+                    leaderboard = leaderboards[contest['contest_id']]
+                    
+                    if not leaderboard.empty:
+                        st.write(f"**Participants:** {len(leaderboard)}/{contest['max_participants']}")
+                        
+                        with st.expander("View Participants"):
+                            display_df = leaderboard[['username', 'team_name']].copy()
+                            display_df.columns = ['Username', 'Team Name']
+                            display_df.index = range(1, len(display_df) + 1)
+                            st.dataframe(display_df, use_container_width=True)
+                    else:
+                        st.write("**Participants:** 0")
+                        st.info("No participants yet - join now!")
+                    
+                    st.markdown("---")
+        
+        # Overall statistics
+        st.markdown("### 📈 Overall Statistics")
         
-        for idx, contest in upcoming_contests.iterrows():
-            match_info = next((f for f in FIXTURES_DATA if f['match_id'] == contest['match_id']), None)
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            total_contests = len(contests_df)
+            st.metric("Total Contests", total_contests)
+        
+        with col2:
+            completed_count = len(completed_contests)
+            st.metric("Completed", completed_count)
+        
+        with col3:
+            live_count = len(live_contests)
+            st.metric("Live", live_count)
+        
+        with col4:
+            total_prizes = contests_df['prize_pool'].sum()
+            st.metric("Total Prizes", f"₹{total_prizes:,}")
+        
+        # Hall of Fame - Most wins
+        if not completed_contests.empty:
+            st.markdown("### 🏛️ Hall of Fame")
+            
+            # Read pre-aggregated winner stats maintained when contests complete
+            top_winners = get_hall_of_fame('wins', 5)
             
-            if match_info:
-                st.markdown(f"#### {contest['name']}")
-                st.write(f"**Match:** {match_info['teams'][0]} vs {match_info['teams'][1]}")
-                st.write(f"**Entry Fee:** ₹{contest['entry_fee']} | **Prize Pool:** ₹{contest['prize_pool']}")
+            if not top_winners.empty:
+                st.markdown("#### 🏆 Most Contest Wins:")
+                for i, (_, winner) in enumerate(top_winners.iterrows()):
+                    if i == 0:
+                        st.success(f"🏆 **Champion:** {winner['username']} - {winner['wins']} win(s)")
+                    else:
+                        st.write(f"**{i+1}.** {winner['username']} - {winner['wins']} win(s)")
                 
-                # Get current participants
-                leaderboard = get_leaderboard(contest['contest_id'])
+                # Highest single contest score
+                top_scorer = get_hall_of_fame('best_score', 1)
+                if not top_scorer.empty:
+                    highest_score = top_scorer.iloc[0]
+                    st.markdown("#### 🎯 Highest Single Contest Score:")
+                    st.info(f"**{highest_score['username']}** - {highest_score['best_score']} points in {highest_score['best_contest']}")
                 
-                if not leaderboard.empty:
-                    st.write(f"**Participants:** {len(leaderboard)}/{contest['max_participants']}")
-                    
-                    with st.expander("View Participants"):
-                        display_df = leaderboard[['username', 'team_name']].copy()
-                        display_df.columns = ['Username', 'Team Name']
-                        display_df.index = range(1, len(display_df) + 1)
-                        st.dataframe(display_df, use_container_width=True)
-                else:
-                    st.write("**Participants:** 0")
-                    st.info("No participants yet - join now!")
+                # Leaders by any aggregate metric
+                st.markdown("#### 📊 Season Leaders:")
+                metric_labels = {
+                    'wins': 'Wins',
+                    'podiums': 'Podium Finishes',
+                    'total_prize_money': 'Prize Money',
+                    'contests_entered': 'Contests Entered'
+                }
+                metric = st.selectbox("Rank by", list(metric_labels.keys()), format_func=lambda x: metric_labels[x])
+                leaders = get_hall_of_fame(metric, 10)
                 
-                st.markdown("---")
+                if not leaders.empty:
+                    display_df = leaders[['username', 'wins', 'podiums', 'total_prize_money', 'contests_entered']].copy()
+                    display_df.columns = ['Username', 'Wins', 'Podiums', 'Prize Money (₹)', 'Contests']
+                    display_df.index = range(1, len(display_df) + 1)
+                    st.dataframe(display_df, use_container_width=True)
     
-    # Overall statistics
-    st.markdown("### 📈 Overall Statistics")
+    else:
+        st.info("No contests available yet")
+        st.markdown("### 🎯 How Contest Winners Are Determined")
+        # Prize shares for a full podium, from the split finalize_contest pays out
+        prize_lines = "\n".join(
+            f"   - {place} Place: {share:.0%} of prize pool"
+            for place, share in zip(['1st', '2nd', '3rd'], PRIZE_DISTRIBUTION[max(PRIZE_DISTRIBUTION)])
+        )
+        st.markdown(f"""
+1. **Points Calculation**: Based on player performance in matches
+2. **Captain Bonus**: Captain gets 2x points
+3. **Vice-Captain Bonus**: Vice-captain gets 1.5x points
+4. **Final Ranking**: Teams ranked by total points after match completion
+5. **Prize Distribution**:
+{prize_lines}
+        """)
     
-    col1, col2, col3, col4 = st.columns(4)
+    # Navigation buttons
+    st.markdown("---")
+    col1, col2, col3 = st.columns(3)
     
     with col1:
-        total_contests = len(contests_df)
-        st.metric("Total Contests", total_contests)
+        if st.button("🏆 Join Contest", use_container_width=True):
+            st.switch_page("pages/4_🏆_Contests.py")
     
     with col2:
-        completed_count = len(completed_contests)
-        st.metric("Completed", completed_count)
+        if st.button("📊 View Results", use_container_width=True):
+            st.switch_page("pages/6_📊_Results.py")
     
     with col3:
-        live_count = len(live_contests)
-        st.metric("Live", live_count)
-    
-    with col4:
-        total_prizes = contests_df['prize_pool'].sum()
-        st.metric("Total Prizes", f"₹{total_prizes:,}")
-    
-    # Hall of Fame - Most wins
-    if not completed_contests.empty:
-        st.markdown("### 🏛️ Hall of Fame")
-        
-        # Get all winners from completed contests
-        all_winners = []
-        for _, contest in completed_contests.iterrows():
-            leaderboard = get_leaderboard(contest['contest_id'])
-            if not leaderboard.empty:
-                winner = leaderboard.iloc[0]
-                all_winners.append({
-                    'username': winner['username'],
-                    'contest_name': contest['name'],
-                    'points': winner['total_points']
-                })
-        
-        if all_winners:
-            winners_df = pd.DataFrame(all_winners)
-            
-            # Count wins per user
-            win_counts = winners_df['username'].value_counts()
-            
-            st.markdown("#### 🏆 Most Contest Wins:")
-            for i, (username, wins) in enumerate(win_counts.head(5).items()):
-                if i == 0:
-                    st.success(f"🏆 **Champion:** {username} - {wins} win(s)")
-                else:
-                    st.write(f"**{i+1}.** {username} - {wins} win(s)")
-            
-            # Highest single contest score
-            if all_winners:
-                highest_score = max(all_winners, key=lambda x: x['points'])
-                st.markdown("#### 🎯 Highest Single Contest Score:")
-                st.info(f"**{highest_score['username']}** - {highest_score['points']} points in {highest_score['contest_name']}")
-
-else:
-    st.info("No contests available yet")
-    st.markdown("### 🎯 How Contest Winners Are Determined")
-    st.markdown("""
-    1. **Points Calculation**: Based on player performance in matches
-    2. **Captain Bonus**: Captain gets 2x points
-    3. **Vice-Captain Bonus**: Vice-captain gets 1.5x points
-    4. **Final Ranking**: Teams ranked by total points after match completion
-    5. **Prize Distribution**: 
-       - 1st Place: 50% of prize pool
-       - 2nd Place: 30% of prize pool
-       - 3rd Place: 20% of prize pool
-    """)
-
-# Navigation buttons
-st.markdown("---")
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    if st.button("🏆 Join Contest", use_container_width=True):
-        st.switch_page("pages/4_🏆_Contests.py")
-
-with col2:
-    if st.button("📊 View Results", use_container_width=True):
-        st.switch_page("pages/6_📊_Results.py")
-
-with col3:
-    if st.button("🏠 Home", use_container_width=True):
-        st.switch_page("app.py")
\ No newline at end of file
+        if st.button("🏠 Home", use_container_width=True):
+            st.switch_page("app.py")
@@ -0,0 +1,24 @@
+import pytest
+from utils.passwords import hash_password, verify_password, needs_rehash
+
+FAST_SCRYPT = {'n': 2 ** 4, 'r': 8, 'p': 1}
+
+def test_verify_password_accepts_matching_password():
+    stored_hash = hash_password('secret', 'scrypt', FAST_SCRYPT)
+    assert verify_password('secret', stored_hash)
+    assert not verify_password('wrong', stored_hash)
+
+@pytest.mark.parametrize('corrupted', [
+    'scrypt$n=16,r=8,p=1$abc$zz',          # odd-length and non-hex salt/digest
+    'scrypt$n=sixteen,r=8,p=1$00$00',      # non-integer parameter
+    'scrypt$n=16,r=8$00ff$00ff',           # missing parameter
+    'scrypt$n16,r=8,p=1$00ff$00ff',        # parameter without a value
+    'bcrypt$rounds=12$00ff$00ff',          # unknown KDF
+    'scrypt$n=16,r=8,p=1$',                # truncated
+    'é' * 64,                              # non-ASCII legacy hash
+])
+def test_verify_password_rejects_corrupted_hash(corrupted):
+    assert verify_password('secret', corrupted) is False
+
+def test_needs_rehash_for_corrupted_hash():
+    assert needs_rehash('scrypt$n=16,r=8,p=1$abc$zz')
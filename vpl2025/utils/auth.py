@@ -1,9 +1,12 @@
 import streamlit as st
-import pandas as pd
-import hashlib
+import streamlit.components.v1 as components
 import uuid
 from datetime import datetime
-import os
+from utils.data_manager import refresh_username_cache
+from utils.data_store import read_table
+from utils.user_store import insert_user, update_user, get_user_by_username, get_user_by_email
+from utils import passwords
+from utils import session_store
 
 def initialize_auth():
     """Initialize authentication system with proper session state management"""
@@ -19,30 +22,78 @@ def initialize_auth():
     
     if 'is_admin' not in st.session_state:
         st.session_state.is_admin = False
+    
+    if 'session_token' not in st.session_state:
+        st.session_state.session_token = None
+    
+    if session_store.is_enabled():
+        _restore_session()
+        _write_session_cookie()
+
+def _get_client_token():
+    """Get the session token sent by the browser in its session cookie"""
+    if not hasattr(st, 'context'):
+        return None
+    return st.context.cookies.get(session_store.SESSION_COOKIE)
+
+def _queue_session_cookie(token, max_age):
+    """Set (or with max_age 0, clear) the session cookie on the next run"""
+    # Login and logout rerun straight away, so the cookie is written by the following run
+    st.session_state.session_cookie_update = (token, max_age)
 
-def safe_read_csv(file_path, default_columns):
-    """Safely read CSV file with fallback to empty DataFrame"""
-    try:
-        if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
-            return pd.read_csv(file_path)
-        else:
-            return pd.DataFrame(columns=default_columns)
-    except (pd.errors.EmptyDataError, pd.errors.ParserError):
-        return pd.DataFrame(columns=default_columns)
+def _write_session_cookie():
+    """Send a queued session cookie change to the browser"""
+    update = st.session_state.pop('session_cookie_update', None)
+    if update is None:
+        return
+    token, max_age = update
+    # Streamlit cannot set response headers, so the cookie is written by a
+    # script in the page; it is SameSite=Strict, and Secure over HTTPS
+    components.html(
+        f"""<script>
+        window.parent.document.cookie = "{session_store.SESSION_COOKIE}={token}; Max-Age={max_age}; Path=/; SameSite=Strict"
+            + (window.parent.location.protocol === "https:" ? "; Secure" : "");
+        </script>""",
+        height=0
+    )
+
+def _restore_session():
+    """Restore identity from a shared session token, so any replica can serve the user"""
+    if st.session_state.authenticated:
+        return
+    
+    token = _get_client_token()
+    session = session_store.get_session(token)
+    if session is None:
+        return
+    
+    st.session_state.authenticated = True
+    st.session_state.user_id = session['user_id']
+    st.session_state.username = session['username']
+    st.session_state.is_admin = session['is_admin']
+    st.session_state.session_token = token
+
+def _persist_session():
+    """Store the logged-in identity in the shared session store, if enabled"""
+    token = session_store.create_session(
+        st.session_state.user_id,
+        st.session_state.username,
+        st.session_state.is_admin
+    )
+    if token:
+        st.session_state.session_token = token
+        _queue_session_cookie(token, session_store.SESSION_TTL_SECONDS)
 
 def hash_password(password):
     """Hash password for storage"""
-    return hashlib.sha256(password.encode()).hexdigest()
+    return passwords.hash_password(password)
 
 def load_users():
     """Load users from CSV file"""
-    default_columns = ['user_id', 'username', 'email', 'password_hash', 'is_admin', 'created_at']
-    return safe_read_csv('data/users.csv', default_columns)
+    return read_table('users')
 
 def save_user(username, email, password, is_admin=False):
-    """Save new user to CSV"""
-    users_df = load_users()
-    
+    """Append a new user, returning None if the username or email is taken"""
     user_id = str(uuid.uuid4())
     new_user = {
         'user_id': user_id,
@@ -53,21 +104,21 @@ def save_user(username, email, password, is_admin=False):
         'created_at': datetime.now().isoformat()
     }
     
-    users_df = pd.concat([users_df, pd.DataFrame([new_user])], ignore_index=True)
-    users_df.to_csv('data/users.csv', index=False)
+    if not insert_user(new_user):
+        return None
+    refresh_username_cache()
     return user_id
 
 def authenticate_user(username, password):
     """Authenticate user credentials"""
-    users_df = load_users()
-    
-    if not users_df.empty:
-        user_row = users_df[users_df['username'] == username]
-        if not user_row.empty:
-            stored_hash = user_row.iloc[0]['password_hash']
-            if stored_hash == hash_password(password):
-                return user_row.iloc[0].to_dict()
-    return None
+    user = get_user_by_username(username)
+    if user is None or not passwords.verify_password_pooled(password, user['password_hash']):
+        return None
+    
+    # Upgrade legacy or outdated hashes while we have the plain password
+    if passwords.needs_rehash(user['password_hash']):
+        update_user(user['user_id'], password_hash=hash_password(password))
+    return dict(user)
 
 def check_authentication():
     """Check if user is authenticated, show login if not"""
@@ -98,6 +149,7 @@ def check_authentication():
                     st.session_state.user_id = user['user_id']
                     st.session_state.username = user['username']
                     st.session_state.is_admin = user['is_admin']
+                    _persist_session()
                     st.success("Login successful!")
                     st.rerun()
                 else:
@@ -114,9 +166,11 @@ def check_authentication():
             
             if register:
                 if reg_password == reg_confirm:
-                    users_df = load_users()
-                    if users_df.empty or reg_username not in users_df['username'].values:
-                        user_id = save_user(reg_username, reg_email, reg_password)
+                    if get_user_by_username(reg_username) is not None:
+                        st.error("Username already exists")
+                    elif reg_email and get_user_by_email(reg_email) is not None:
+                        st.error("Email already registered")
+                    elif save_user(reg_username, reg_email, reg_password):
                         st.success("Account created successfully! Please login.")
                     else:
                         st.error("Username already exists")
@@ -137,6 +191,7 @@ def check_authentication():
                     st.session_state.user_id = "admin"
                     st.session_state.username = "Administrator"
                     st.session_state.is_admin = True
+                    _persist_session()
                     st.success("Admin login successful!")
                     st.rerun()
                 else:
@@ -147,6 +202,7 @@ def check_authentication():
                         st.session_state.user_id = user['user_id']
                         st.session_state.username = user['username']
                         st.session_state.is_admin = True
+                        _persist_session()
                         st.success("Admin login successful!")
                         st.rerun()
                     else:
@@ -156,6 +212,12 @@ def check_authentication():
 
 def logout():
     """Logout current user"""
+    # End the shared session so other replicas stop accepting its token
+    if st.session_state.get('session_token'):
+        session_store.delete_session(st.session_state.session_token)
+        st.session_state.session_token = None
+        _queue_session_cookie('', 0)
+    
     # Clear session state
     st.session_state.authenticated = False
     st.session_state.user_id = None
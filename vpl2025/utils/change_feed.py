@@ -0,0 +1,97 @@
+import threading
+import asyncio
+from collections import deque
+from itertools import islice
+from datetime import datetime
+
+# In-process change feed: every data write publishes an event with a new,
+# strictly increasing version. Viewers keep a version cursor and either read
+# the events after it, block until new ones arrive, or subscribe for pushes.
+EVENT_TYPES = ['performance_saved', 'team_points_updated', 'contest_status_changed', 'rescore_completed', 'fixture_status_changed', 'match_transition_completed']
+MAX_EVENTS = 10000
+
+_feed = {
+    'version': 0,
+    'events': deque(maxlen=MAX_EVENTS),
+    'subscribers': {},
+    'next_subscriber': 0
+}
+_condition = threading.Condition()
+
+def publish(event_type, **payload):
+    """Publish an event to the feed and notify waiters and subscribers"""
+    with _condition:
+        _feed['version'] += 1
+        event = {
+            'version': _feed['version'],
+            'type': event_type,
+            'timestamp': datetime.now().isoformat(),
+            **payload
+        }
+        _feed['events'].append(event)
+        subscribers = list(_feed['subscribers'].values())
+        _condition.notify_all()
+    
+    # Callbacks run outside the lock so they may read the feed themselves
+    for callback, event_types in subscribers:
+        if event_types is None or event_type in event_types:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Error in change feed subscriber: {e}")
+    return event['version']
+
+def get_version():
+    """Get the latest published version"""
+    return _feed['version']
+
+def get_events_since(since_version, event_types=None):
+    """Get (current_version, events) after a cursor, events is None if the cursor is stale"""
+    with _condition:
+        version = _feed['version']
+        events = _feed['events']
+        
+        # Cursor from a previous process lifetime or older than the retained log
+        if since_version > version:
+            return version, None
+        if since_version == version:
+            return version, []
+        if not events or events[0]['version'] > since_version + 1:
+            return version, None
+        
+        # Events are contiguous, so the cursor maps straight to a position
+        start = len(events) - (version - since_version)
+        matched = [
+            event for event in islice(events, start, None)
+            if event_types is None or event['type'] in event_types
+        ]
+        return version, matched
+
+def wait_for_events(since_version, timeout=None, event_types=None):
+    """Block until events after a cursor are available or the timeout expires"""
+    with _condition:
+        _condition.wait_for(lambda: _feed['version'] > since_version, timeout=timeout)
+    return get_events_since(since_version, event_types)
+
+def subscribe(callback, event_types=None):
+    """Register a callback for published events and return its subscription id"""
+    with _condition:
+        subscription_id = _feed['next_subscriber']
+        _feed['next_subscriber'] += 1
+        _feed['subscribers'][subscription_id] = (callback, set(event_types) if event_types else None)
+    return subscription_id
+
+def unsubscribe(subscription_id):
+    """Remove a subscription"""
+    with _condition:
+        return _feed['subscribers'].pop(subscription_id, None) is not None
+
+def subscribe_queue(event_types=None, loop=None):
+    """Subscribe an asyncio queue to the feed, returning (queue, subscription_id)"""
+    loop = loop or asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    
+    def enqueue(event):
+        loop.call_soon_threadsafe(queue.put_nowait, event)
+    
+    return queue, subscribe(enqueue, event_types)
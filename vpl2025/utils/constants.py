@@ -142,7 +142,7 @@ TEAMS_DATA = {
     }
 }
 
-# Fixtures Data (mutable for admin control)
+# Fixtures seed schedule, copied to data/fixtures.csv on first run (see utils/fixtures_store.py)
 FIXTURES_DATA = [
     # Saturday Fixtures
     {"match_id": "M001", "match_no": 1, "teams": ["Clutch Knights", "Friendz Titans"], "time": "6:00 AM", "day": "Saturday", "status": "upcoming"},
@@ -155,3 +155,13 @@ TEAM_BUDGET = 4500
 TEAM_SIZE = 7  # 7 players per team
 CAPTAIN_MULTIPLIER = 2.0
 VICE_CAPTAIN_MULTIPLIER = 1.5
+
+# Prize split by number of ranked places (share of prize pool per rank)
+PRIZE_DISTRIBUTION = {
+    1: [1.0],
+    2: [0.7, 0.3],
+    3: [0.5, 0.3, 0.2]
+}
+
+# Overs per innings, used to estimate match progress for projections
+INNINGS_OVERS = 6
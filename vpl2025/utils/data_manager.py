@@ -1,67 +1,54 @@
 import pandas as pd
+import numpy as np
 import os
 from datetime import datetime
 import uuid
-
-def safe_read_csv(file_path, default_columns):
-    """Safely read CSV file with proper error handling"""
-    try:
-        # Check if file exists and has content
-        if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
-            df = pd.read_csv(file_path)
-            # Check if DataFrame is empty or has wrong columns
-            if df.empty or not all(col in df.columns for col in default_columns):
-                return create_empty_dataframe(default_columns)
-            return df
-        else:
-            return create_empty_dataframe(default_columns)
-    except (pd.errors.EmptyDataError, pd.errors.ParserError, Exception) as e:
-        print(f"Error reading {file_path}: {e}")
-        return create_empty_dataframe(default_columns)
-
-def create_empty_dataframe(columns):
-    """Create an empty DataFrame with specified columns"""
-    return pd.DataFrame(columns=columns)
+import threading
+from utils.constants import PRIZE_DISTRIBUTION
+from utils import change_feed
+from utils.instrumentation import timed
+from utils.fixtures_store import initialize_fixtures_file
+from utils.data_store import ensure_table, read_file, write_file, read_table, write_table, table_columns, file_version, file_exists, table_lock
 
 def ensure_data_directory():
     """Ensure data directory exists"""
     if not os.path.exists('data'):
         os.makedirs('data')
 
+# Set once the data files have been checked in this process
+_data_files_state = {'initialized': False}
+_data_files_lock = threading.Lock()
+
 def initialize_data_files():
-    """Initialize all CSV data files with proper headers"""
-    ensure_data_directory()
-    
-    # Users file
-    users_columns = ['user_id', 'username', 'email', 'password_hash', 'is_admin', 'created_at']
-    users_df = safe_read_csv('data/users.csv', users_columns)
-    users_df.to_csv('data/users.csv', index=False)
-    
-    # Contests file
-    contests_columns = ['contest_id', 'name', 'match_id', 'entry_fee', 'prize_pool', 'max_participants', 'created_by', 'created_at', 'status']
-    contests_df = safe_read_csv('data/contests.csv', contests_columns)
-    contests_df.to_csv('data/contests.csv', index=False)
-    
-    # Teams file
-    teams_columns = ['team_id', 'user_id', 'contest_id', 'team_name', 'players', 'captain', 'vice_captain', 'total_points', 'created_at']
-    teams_df = safe_read_csv('data/teams.csv', teams_columns)
-    teams_df.to_csv('data/teams.csv', index=False)
-    
-    # Performances file
-    performances_columns = ['performance_id', 'match_id', 'player_name', 'team_name', 'runs', 'balls_faced', 'fours', 'sixes', 'wickets', 'overs_bowled', 'runs_conceded', 'catches', 'stumpings', 'run_outs', 'total_points']
-    performances_df = safe_read_csv('data/performances.csv', performances_columns)
-    performances_df.to_csv('data/performances.csv', index=False)
-    
-    # Results file
-    results_columns = ['result_id', 'contest_id', 'match_id', 'user_id', 'team_id', 'total_points', 'rank', 'prize_amount', 'created_at']
-    results_df = safe_read_csv('data/results.csv', results_columns)
-    results_df.to_csv('data/results.csv', index=False)
+    """Create missing CSV data files and check headers, once per process"""
+    if _data_files_state['initialized']:
+        return
+    
+    with _data_files_lock:
+        if _data_files_state['initialized']:
+            return
+        ensure_data_directory()
+        
+        # Existing tables are never rewritten, only created or header-checked
+        for table in ['users', 'contests', 'teams', 'results', 'hall_of_fame']:
+            ensure_table(table)
+        
+        # Performances are partitioned per match under data/performances/
+        os.makedirs(PERFORMANCES_DIR, exist_ok=True)
+        
+        # Fixtures file (seeded from the built-in schedule)
+        initialize_fixtures_file()
+        
+        # Contests completed before results were recorded get them now
+        finalize_completed_contests()
+        
+        _data_files_state['initialized'] = True
 
+@timed
 def save_contest(name, match_id, entry_fee, prize_pool, max_participants, created_by):
     """Save new contest with error handling"""
     try:
-        contests_columns = ['contest_id', 'name', 'match_id', 'entry_fee', 'prize_pool', 'max_participants', 'created_by', 'created_at', 'status']
-        contests_df = safe_read_csv('data/contests.csv', contests_columns)
+        contests_df = read_table('contests')
         
         contest_id = str(uuid.uuid4())
         new_contest = {
@@ -77,162 +64,553 @@ def save_contest(name, match_id, entry_fee, prize_pool, max_participants, create
         }
         
         contests_df = pd.concat([contests_df, pd.DataFrame([new_contest])], ignore_index=True)
-        contests_df.to_csv('data/contests.csv', index=False)
+        write_table('contests', contests_df)
         return contest_id
     except Exception as e:
         print(f"Error saving contest: {e}")
         return None
 
+@timed
 def save_team(user_id, contest_id, team_name, players, captain, vice_captain):
     """Save user team with validation for one team per contest"""
     try:
-        teams_columns = ['team_id', 'user_id', 'contest_id', 'team_name', 'players', 'captain', 'vice_captain', 'total_points', 'created_at']
-        teams_df = safe_read_csv('data/teams.csv', teams_columns)
-        
-        # Check if user already has a team in this contest
-        existing_team = teams_df[
-            (teams_df['user_id'] == user_id) & 
-            (teams_df['contest_id'] == contest_id)
-        ]
-        
-        if not existing_team.empty:
-            print(f"User {user_id} already has a team in contest {contest_id}")
-            return None  # User already has a team in this contest
-        
-        team_id = str(uuid.uuid4())
-        new_team = {
-            'team_id': team_id,
-            'user_id': user_id,
-            'contest_id': contest_id,
-            'team_name': team_name,
-            'players': ','.join(players),
-            'captain': captain,
-            'vice_captain': vice_captain,
-            'total_points': 0,
-            'created_at': datetime.now().isoformat()
-        }
-        
-        teams_df = pd.concat([teams_df, pd.DataFrame([new_team])], ignore_index=True)
-        teams_df.to_csv('data/teams.csv', index=False)
-        return team_id
+        with table_lock('teams'):
+            teams_df = read_table('teams')
+            
+            # Check if user already has a team in this contest
+            existing_team = teams_df[
+                (teams_df['user_id'] == user_id) & 
+                (teams_df['contest_id'] == contest_id)
+            ]
+            
+            if not existing_team.empty:
+                print(f"User {user_id} already has a team in contest {contest_id}")
+                return None  # User already has a team in this contest
+            
+            # Entries lock once the contest's match goes live
+            contests_df = get_contests()
+            contest = contests_df[contests_df['contest_id'] == contest_id] if not contests_df.empty else contests_df
+            if contest.empty or contest.iloc[0]['status'] != 'active':
+                print(f"Contest {contest_id} is not open for entries")
+                return None
+            
+            team_id = str(uuid.uuid4())
+            new_team = {
+                'team_id': team_id,
+                'user_id': user_id,
+                'contest_id': contest_id,
+                'team_name': team_name,
+                'players': ','.join(players),
+                'captain': captain,
+                'vice_captain': vice_captain,
+                'total_points': 0,
+                'created_at': datetime.now().isoformat()
+            }
+            
+            teams_df = pd.concat([teams_df, pd.DataFrame([new_team])], ignore_index=True)
+            write_table('teams', teams_df)
+            return team_id
     except Exception as e:
         print(f"Error saving team: {e}")
         return None
 
+@timed
 def get_contests():
     """Get all contests with error handling"""
-    contests_columns = ['contest_id', 'name', 'match_id', 'entry_fee', 'prize_pool', 'max_participants', 'created_by', 'created_at', 'status']
-    return safe_read_csv('data/contests.csv', contests_columns)
+    return read_table('contests')
 
+@timed
 def get_user_teams(user_id):
     """Get teams for a specific user with error handling"""
-    teams_columns = ['team_id', 'user_id', 'contest_id', 'team_name', 'players', 'captain', 'vice_captain', 'total_points', 'created_at']
-    teams_df = safe_read_csv('data/teams.csv', teams_columns)
+    teams_df = read_table('teams')
     
     if not teams_df.empty:
         return teams_df[teams_df['user_id'] == user_id]
     return teams_df
 
+# Performances are partitioned per match (data/performances/<match_id>.csv) and
+# each match has its own write lock, so concurrent live matches never share a file
+PERFORMANCES_DIR = 'data/performances'
+
+def _match_lock(match_id):
+    """Get the cross-process write lock for a match's performance partition"""
+    return table_lock(_performance_partition_path(match_id))
+
+def _performance_partition_path(match_id):
+    """Get the performance partition file for a match"""
+    return os.path.join(PERFORMANCES_DIR, f"{match_id}.csv")
+
+def _read_match_performances(match_id):
+    """Read a match's performance partition, falling back to the legacy shared file"""
+    performances_columns = table_columns('performances')
+    partition_path = _performance_partition_path(match_id)
+    if file_exists(partition_path):
+        return read_file(partition_path, performances_columns)
+    
+    # Matches scored before partitioning still live in data/performances.csv
+    legacy_df = read_table('performances')
+    if not legacy_df.empty:
+        return legacy_df[legacy_df['match_id'] == match_id].reset_index(drop=True)
+    return legacy_df
+
+# {match_id: {file version before a write by this process: version after it}},
+# so change cursors can tell this process's writes from other processes'
+_own_performance_writes = {}
+MAX_OWN_WRITES = 1000
+
+def _write_match_performances(match_id, performances_df):
+    """Write a match's performance partition atomically, recording the version change"""
+    before = _match_performances_version(match_id)
+    write_file(_performance_partition_path(match_id), performances_df)
+    own_writes = _own_performance_writes.setdefault(match_id, {})
+    own_writes[before] = _match_performances_version(match_id)
+    if len(own_writes) > MAX_OWN_WRITES:
+        own_writes.pop(next(iter(own_writes)))
+
+def _is_own_change(match_id, since_file_version, current_file_version):
+    """Check whether only this process's writes lie between two file versions"""
+    own_writes = _own_performance_writes.get(match_id, {})
+    file_version = since_file_version
+    for _ in range(len(own_writes) + 1):
+        if file_version == current_file_version:
+            return True
+        if file_version not in own_writes:
+            return False
+        file_version = own_writes[file_version]
+    return False
+
+@timed
 def get_performances(match_id):
     """Get performances for a specific match"""
-    performances_columns = ['performance_id', 'match_id', 'player_name', 'team_name', 'runs', 'balls_faced', 'fours', 'sixes', 'wickets', 'overs_bowled', 'runs_conceded', 'catches', 'stumpings', 'run_outs', 'total_points']
-    performances_df = safe_read_csv('data/performances.csv', performances_columns)
-    
-    if not performances_df.empty:
-        return performances_df[performances_df['match_id'] == match_id]
-    return performances_df
+    return _read_match_performances(match_id)
+
+def _match_performances_version(match_id):
+    """Get the change marker for the file holding a match's performances"""
+    version = file_version(_performance_partition_path(match_id))
+    return version if version is not None else file_version('performances')
 
+# {match_id: {'version': file version, 'map': {player_name: record}}}, reloaded
+# when the match's file changes on disk (including writes by other processes)
+_match_performance_cache = {}
+
+@timed
+def get_match_performance_map(match_id):
+    """Get a cached player name to performance record lookup for a match"""
+    # Read the version first, so a write racing the load leaves a stale marker and reloads next time
+    version = _match_performances_version(match_id)
+    cached = _match_performance_cache.get(match_id)
+    if cached is None or version is None or cached['version'] != version:
+        performances = get_performances(match_id)
+        cached = {
+            'version': version,
+            'map': {record['player_name']: record for record in performances.to_dict('records')}
+        }
+        _match_performance_cache[match_id] = cached
+    return cached['map']
+
+@timed
 def save_performance(match_id, player_name, team_name, performance_data):
     """Save player performance with error handling"""
     try:
-        performances_columns = ['performance_id', 'match_id', 'player_name', 'team_name', 'runs', 'balls_faced', 'fours', 'sixes', 'wickets', 'overs_bowled', 'runs_conceded', 'catches', 'stumpings', 'run_outs', 'total_points']
-        performances_df = safe_read_csv('data/performances.csv', performances_columns)
+        with _match_lock(match_id):
+            saved = _save_performance_locked(match_id, player_name, team_name, performance_data)
+        
+        # Publish the saved row so live viewers can fetch just this change
+        change_feed.publish('performance_saved', match_id=match_id, record=saved)
+        return True
+    except Exception as e:
+        print(f"Error saving performance: {e}")
+        return False
+
+def _save_performance_locked(match_id, player_name, team_name, performance_data):
+    """Upsert one performance row while holding the match lock, returning the saved row"""
+    performances_df = _read_match_performances(match_id)
+    
+    # Check if performance already exists
+    existing = performances_df[
+        (performances_df['match_id'] == match_id) & 
+        (performances_df['player_name'] == player_name)
+    ]
+    
+    if not existing.empty:
+        # Update existing performance
+        idx = existing.index[0]
+        for key, value in performance_data.items():
+            if key in performances_df.columns:
+                performances_df.loc[idx, key] = value
+    else:
+        # Add new performance
+        performance_id = str(uuid.uuid4())
+        new_performance = {
+            'performance_id': performance_id,
+            'match_id': match_id,
+            'player_name': player_name,
+            'team_name': team_name,
+            **performance_data
+        }
         
-        # Check if performance already exists
-        existing = performances_df[
-            (performances_df['match_id'] == match_id) & 
-            (performances_df['player_name'] == player_name)
-        ]
+        performances_df = pd.concat([performances_df, pd.DataFrame([new_performance])], ignore_index=True)
+    
+    _write_match_performances(match_id, performances_df)
+    _match_performance_cache.pop(match_id, None)
+    
+    return performances_df[performances_df['player_name'] == player_name].iloc[0].to_dict()
+
+@timed
+def save_performances_bulk(match_id, performances):
+    """Upsert a whole scorecard of performances for a match in a single write"""
+    try:
+        incoming = performances.copy()
+        incoming['match_id'] = match_id
         
-        if not existing.empty:
-            # Update existing performance
-            idx = existing.index[0]
-            for key, value in performance_data.items():
-                if key in performances_df.columns:
-                    performances_df.loc[idx, key] = value
-        else:
-            # Add new performance
-            performance_id = str(uuid.uuid4())
-            new_performance = {
-                'performance_id': performance_id,
-                'match_id': match_id,
-                'player_name': player_name,
-                'team_name': team_name,
-                **performance_data
-            }
+        with _match_lock(match_id):
+            performances_df = _read_match_performances(match_id)
+            
+            # Keep existing ids for players already scored in this match
+            existing_ids = performances_df.set_index('player_name')['performance_id']
+            incoming['performance_id'] = incoming['player_name'].map(existing_ids)
+            missing_ids = incoming['performance_id'].isna()
+            incoming.loc[missing_ids, 'performance_id'] = [str(uuid.uuid4()) for _ in range(missing_ids.sum())]
             
-            performances_df = pd.concat([performances_df, pd.DataFrame([new_performance])], ignore_index=True)
+            replaced = performances_df['player_name'].isin(incoming['player_name'])
+            performances_df = pd.concat([performances_df[~replaced], incoming], ignore_index=True)
+            _write_match_performances(match_id, performances_df)
+            _match_performance_cache.pop(match_id, None)
         
-        performances_df.to_csv('data/performances.csv', index=False)
+        for record in incoming.to_dict('records'):
+            change_feed.publish('performance_saved', match_id=match_id, record=record)
         return True
     except Exception as e:
-        print(f"Error saving performance: {e}")
+        print(f"Error saving performances: {e}")
         return False
 
+def get_performance_version():
+    """Get the current change feed version for performance cursors"""
+    return change_feed.get_version()
+
+def get_performance_file_version(match_id):
+    """Get the change marker of a match's performances file, for cursors across processes"""
+    return _match_performances_version(match_id)
+
+def get_performance_changes(match_id, since_version, since_file_version):
+    """Get (current_version, rows) for performances of a match saved after a version cursor"""
+    version, events = change_feed.get_events_since(since_version, ['performance_saved'])
+    
+    # rows is None when the cursor fell off the feed or predates a restart: reload fully
+    if events is None:
+        return version, None
+    
+    # Writes from other processes (ingest service, other replicas) never reach this
+    # process's feed, so any file change not made here also means a full reload
+    if not _is_own_change(match_id, since_file_version, _match_performances_version(match_id)):
+        return version, None
+    
+    # Latest write per player wins
+    changes = {}
+    for event in events:
+        if event['match_id'] == match_id:
+            changes[event['record']['player_name']] = event['record']
+    return version, list(changes.values())
+
+@timed
 def update_contest_status(contest_id, new_status):
     """Update contest status"""
     try:
-        contests_columns = ['contest_id', 'name', 'match_id', 'entry_fee', 'prize_pool', 'max_participants', 'created_by', 'created_at', 'status']
-        contests_df = safe_read_csv('data/contests.csv', contests_columns)
+        contests_df = read_table('contests')
         
         if not contests_df.empty:
             contests_df.loc[contests_df['contest_id'] == contest_id, 'status'] = new_status
-            contests_df.to_csv('data/contests.csv', index=False)
+            write_table('contests', contests_df)
+            change_feed.publish('contest_status_changed', contest_id=contest_id, status=new_status)
+            
+            # Fold final standings into the Hall of Fame exactly once
+            if new_status == 'completed':
+                return finalize_contest(contest_id)
             return True
         return False
     except Exception as e:
         print(f"Error updating contest status: {e}")
         return False
 
+def calculate_prizes(prize_pool, participants):
+    """Split a prize pool across the top ranks based on number of participants"""
+    if participants <= 0:
+        return []
+    split = PRIZE_DISTRIBUTION[min(participants, len(PRIZE_DISTRIBUTION))]
+    return [prize_pool * share for share in split]
+
+def _record_contest_results(contest_id):
+    """Write final standings and prize amounts for a contest to results.csv, once"""
+    results_df = read_table('results')
+    
+    # Results already recorded means this contest was finalized before
+    if not results_df.empty and (results_df['contest_id'] == contest_id).any():
+        return True
+    
+    contests_df = get_contests()
+    contest = contests_df[contests_df['contest_id'] == contest_id] if not contests_df.empty else contests_df
+    if contest.empty:
+        return False
+    contest = contest.iloc[0]
+    
+    leaderboard = get_leaderboard(contest_id)
+    if leaderboard.empty:
+        return True
+    
+    # Prize money per place, with tied teams splitting the places they share
+    prizes = calculate_prizes(float(contest['prize_pool']), len(leaderboard))
+    place_prizes = pd.Series([prizes[place] if place < len(prizes) else 0.0 for place in range(len(leaderboard))])
+    prize_amounts = place_prizes.groupby(leaderboard['rank'].to_numpy()).transform('mean')
+    
+    created_at = datetime.now().isoformat()
+    new_results = pd.DataFrame({
+        'result_id': [str(uuid.uuid4()) for _ in range(len(leaderboard))],
+        'contest_id': contest_id,
+        'match_id': contest['match_id'],
+        'user_id': leaderboard['user_id'],
+        'team_id': leaderboard['team_id'],
+        'total_points': leaderboard['total_points'],
+        'rank': leaderboard['rank'],
+        'prize_amount': prize_amounts,
+        'created_at': created_at
+    })
+    results_df = pd.concat([results_df, new_results], ignore_index=True)
+    write_table('results', results_df)
+    return True
+
+@timed
+def rebuild_hall_of_fame():
+    """Regenerate the Hall of Fame aggregates from every recorded result"""
+    results_df = read_table('results')
+    if results_df.empty:
+        write_table('hall_of_fame', pd.DataFrame(columns=table_columns('hall_of_fame')))
+        return True
+    
+    contest_names = get_contests().set_index('contest_id')['name']
+    results_df = results_df.assign(
+        username=results_df['user_id'].map(get_username_map()),
+        best_contest=results_df['contest_id'].map(contest_names),
+        wins=(results_df['rank'] == 1).astype(int),
+        podiums=(results_df['rank'] <= 3).astype(int)
+    )
+    
+    # Sorting by score first makes 'first' pick each user's best contest
+    results_df = results_df.sort_values('total_points', ascending=False, kind='stable')
+    hall_of_fame_df = results_df.groupby('user_id', as_index=False, sort=False).agg(
+        username=('username', 'first'),
+        wins=('wins', 'sum'),
+        podiums=('podiums', 'sum'),
+        total_prize_money=('prize_amount', 'sum'),
+        contests_entered=('contest_id', 'size'),
+        best_score=('total_points', 'first'),
+        best_contest=('best_contest', 'first')
+    )
+    write_table('hall_of_fame', hall_of_fame_df)
+    return True
+
+@timed
+def finalize_contest(contest_id):
+    """Record final results for a completed contest and refresh the Hall of Fame"""
+    try:
+        if not _record_contest_results(contest_id):
+            return False
+        # Rebuilt from results.csv every time, so a failure after the results
+        # write is repaired by finalizing again or by the next startup
+        return rebuild_hall_of_fame()
+    except Exception as e:
+        print(f"Error finalizing contest: {e}")
+        return False
+
+def finalize_completed_contests():
+    """Record results for every completed contest that has none yet, returning how many were finalized"""
+    try:
+        contests_df = get_contests()
+        if contests_df.empty:
+            return 0
+        
+        results_df = read_table('results')
+        finalized_ids = set(results_df['contest_id']) if not results_df.empty else set()
+        pending = contests_df[(contests_df['status'] == 'completed') & ~contests_df['contest_id'].isin(finalized_ids)]
+        finalized = 0
+        for contest_id in pending['contest_id']:
+            try:
+                finalized += bool(_record_contest_results(contest_id))
+            except Exception as e:
+                print(f"Error recording results for contest {contest_id}: {e}")
+        rebuild_hall_of_fame()
+        return finalized
+    except Exception as e:
+        print(f"Error finalizing completed contests: {e}")
+        return 0
+
+@timed
+def get_contest_results(contest_id):
+    """Get the recorded final standings and prize amounts for a contest, by rank"""
+    results_df = read_table('results')
+    if results_df.empty:
+        return results_df
+    
+    contest_results = results_df[results_df['contest_id'] == contest_id].copy()
+    contest_results['username'] = contest_results['user_id'].map(get_username_map())
+    return contest_results.sort_values('rank', kind='stable').reset_index(drop=True)
+
+@timed
+def get_hall_of_fame(metric='wins', top_n=5):
+    """Get the top users from the Hall of Fame aggregates by any metric"""
+    hall_of_fame_df = read_table('hall_of_fame')
+    
+    if hall_of_fame_df.empty or metric not in hall_of_fame_df.columns:
+        return hall_of_fame_df
+    
+    top_users = hall_of_fame_df[hall_of_fame_df[metric] > 0]
+    return top_users.nlargest(top_n, metric).reset_index(drop=True)
+
+# user_id -> username lookup, reloaded when users.csv changes
+_username_cache = {'version': None, 'usernames': None}
+
+@timed
+def get_username_map():
+    """Get a cached user_id to username mapping"""
+    version = file_version('users')
+    if _username_cache['usernames'] is None or _username_cache['version'] != version:
+        users_df = read_table('users')
+        _username_cache['usernames'] = pd.Series(users_df['username'].values, index=users_df['user_id'].values)
+        _username_cache['version'] = version
+    return _username_cache['usernames']
+
+def refresh_username_cache():
+    """Drop the cached username mapping so the next lookup reloads it"""
+    _username_cache['version'] = None
+    _username_cache['usernames'] = None
+
 def get_leaderboard(contest_id):
     """Get leaderboard for a specific contest"""
-    teams_columns = ['team_id', 'user_id', 'contest_id', 'team_name', 'players', 'captain', 'vice_captain', 'total_points', 'created_at']
-    teams_df = safe_read_csv('data/teams.csv', teams_columns)
+    return get_leaderboards([contest_id])[contest_id]
+
+# Built leaderboards per contest, valid while teams.csv and users.csv are unchanged
+_leaderboard_cache = {'version': None, 'leaderboards': {}}
+
+@timed
+def get_leaderboards(contest_ids):
+    """Get leaderboards for several contests, building any uncached ones in a single pass"""
+    contest_ids = list(contest_ids)
+    version = (file_version('teams'), file_version('users'))
+    if _leaderboard_cache['version'] != version or None in version:
+        _leaderboard_cache['version'] = version
+        _leaderboard_cache['leaderboards'] = {}
     
-    users_columns = ['user_id', 'username', 'email', 'password_hash', 'is_admin', 'created_at']
-    users_df = safe_read_csv('data/users.csv', users_columns)
+    cached = _leaderboard_cache['leaderboards']
+    missing = [contest_id for contest_id in contest_ids if contest_id not in cached]
+    if missing:
+        cached.update(_build_leaderboards(missing))
     
-    if not teams_df.empty and not users_df.empty:
-        contest_teams = teams_df[teams_df['contest_id'] == contest_id]
-        
-        if not contest_teams.empty:
-            # Merge with users to get usernames
-            leaderboard = contest_teams.merge(users_df[['user_id', 'username']], on='user_id', how='left')
-            
-            # Sort by total points and add rank
-            leaderboard = leaderboard.sort_values('total_points', ascending=False).reset_index(drop=True)
-            leaderboard['rank'] = range(1, len(leaderboard) + 1)
-            
-            return leaderboard
+    # Callers get their own copies so the cache cannot be modified
+    return {contest_id: cached[contest_id].copy() for contest_id in contest_ids}
+
+def _build_leaderboards(contest_ids):
+    """Build leaderboards for several contests in a single pass over the data"""
+    leaderboards = {contest_id: pd.DataFrame() for contest_id in contest_ids}
+    
+    teams_df = read_table('teams')
+    
+    if teams_df.empty or not contest_ids:
+        return leaderboards
+    
+    contest_teams = teams_df[teams_df['contest_id'].isin(contest_ids)]
+    if contest_teams.empty:
+        return leaderboards
+    
+    # Attach display names from the cached username lookup
+    merged = contest_teams.copy()
+    merged['username'] = merged['user_id'].map(get_username_map())
+    
+    # Sort by total points and rank within each contest, tied teams sharing the
+    # best rank (the same rule as get_user_ranks and the snapshots)
+    merged = merged.sort_values('total_points', ascending=False, kind='stable')
+    merged['rank'] = merged.groupby('contest_id')['total_points'].rank(method='min', ascending=False).astype(int)
+    
+    for contest_id, leaderboard in merged.groupby('contest_id', sort=False):
+        leaderboards[contest_id] = leaderboard.reset_index(drop=True)
     
-    return pd.DataFrame()
+    return leaderboards
+
+# Sorted team points per contest, rebuilt only when teams.csv changes on disk
+_points_index = {'version': None, 'points': {}}
+
+def _get_points_index():
+    """Get ascending sorted team points arrays keyed by contest"""
+    version = file_version('teams')
+    if _points_index['version'] != version or version is None:
+        teams_df = get_all_teams()
+        points = {}
+        if not teams_df.empty:
+            for contest_id, contest_teams in teams_df.groupby('contest_id'):
+                points[contest_id] = np.sort(contest_teams['total_points'].to_numpy(dtype=float))
+        _points_index['version'] = version
+        _points_index['points'] = points
+    return _points_index['points']
+
+def _rank_from_points(sorted_points, user_points):
+    """Rank a score against an ascending sorted points array, ties sharing the best rank"""
+    total_teams = len(sorted_points)
+    first_above = np.searchsorted(sorted_points, user_points, side='right')
+    teams_ahead = total_teams - first_above
+    
+    return {
+        'rank': int(teams_ahead) + 1,
+        'total_teams': total_teams,
+        'percentile': round(100.0 * (total_teams - teams_ahead) / total_teams, 1),
+        'points_to_next': float(sorted_points[first_above] - user_points) if teams_ahead > 0 else None
+    }
+
+def get_user_rank(user_id, contest_id):
+    """Get a user's rank, percentile and points gap to the next rank in a contest"""
+    return get_user_ranks(user_id, [contest_id]).get(contest_id)
+
+@timed
+def get_user_ranks(user_id, contest_ids=None):
+    """Get a user's rank in each of their contests without building leaderboards"""
+    user_teams = get_user_teams(user_id)
+    if user_teams.empty:
+        return {}
+    
+    if contest_ids is not None:
+        user_teams = user_teams[user_teams['contest_id'].isin(list(contest_ids))]
+    
+    points_index = _get_points_index()
+    ranks = {}
+    for _, team in user_teams.iterrows():
+        sorted_points = points_index.get(team['contest_id'])
+        if sorted_points is not None and len(sorted_points) > 0:
+            ranks[team['contest_id']] = _rank_from_points(sorted_points, float(team['total_points']))
+    return ranks
 
 def update_team_points(team_id, total_points):
     """Update team total points"""
+    return update_team_points_bulk({team_id: total_points})
+
+@timed
+def update_team_points_bulk(points_by_team, match_id=None):
+    """Update total points for many teams with a single write"""
     try:
-        teams_columns = ['team_id', 'user_id', 'contest_id', 'team_name', 'players', 'captain', 'vice_captain', 'total_points', 'created_at']
-        teams_df = safe_read_csv('data/teams.csv', teams_columns)
+        with table_lock('teams'):
+            teams_df = read_table('teams')
+            if teams_df.empty:
+                return False
+            
+            team_mask = teams_df['team_id'].isin(list(points_by_team))
+            teams_df.loc[team_mask, 'total_points'] = teams_df.loc[team_mask, 'team_id'].map(points_by_team)
+            write_table('teams', teams_df)
         
-        if not teams_df.empty:
-            teams_df.loc[teams_df['team_id'] == team_id, 'total_points'] = total_points
-            teams_df.to_csv('data/teams.csv', index=False)
-            return True
-        return False
+        contest_ids = teams_df.loc[team_mask, 'contest_id'].unique().tolist()
+        # Events stay small in the retained log; subscribers re-read teams through the cache
+        change_feed.publish('team_points_updated', match_id=match_id, contest_ids=contest_ids, team_count=int(team_mask.sum()))
+        return True
     except Exception as e:
         print(f"Error updating team points: {e}")
         return False
 
+@timed
 def get_all_teams():
     """Get all teams"""
-    teams_columns = ['team_id', 'user_id', 'contest_id', 'team_name', 'players', 'captain', 'vice_captain', 'total_points', 'created_at']
-    return safe_read_csv('data/teams.csv', teams_columns)
\ No newline at end of file
+    return read_table('teams')
\ No newline at end of file
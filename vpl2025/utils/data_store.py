@@ -0,0 +1,244 @@
+import io
+import os
+import threading
+from contextlib import contextmanager
+import pandas as pd
+from utils import instrumentation
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+# Single access point for the CSV tables in data/. Every read goes through
+# read_table (or read_file for per-match partitions), which keeps the parsed
+# frame in memory until the file changes on disk, and every full-table write
+# goes through write_table/write_file, which write atomically and invalidate
+# the cache. Append-only tables (users) add rows with append_table and pick up
+# other processes' appends with read_appended. The storage calls themselves
+# sit behind _backend so another store can be swapped in with set_backend.
+# Read-modify-writes of a shared table hold table_lock, which also excludes
+# other processes (the standalone ingest service, other replicas).
+TABLES = {
+    'users': ('data/users.csv', ['user_id', 'username', 'email', 'password_hash', 'is_admin', 'created_at']),
+    'contests': ('data/contests.csv', ['contest_id', 'name', 'match_id', 'entry_fee', 'prize_pool', 'max_participants', 'created_by', 'created_at', 'status']),
+    'teams': ('data/teams.csv', ['team_id', 'user_id', 'contest_id', 'team_name', 'players', 'captain', 'vice_captain', 'total_points', 'created_at']),
+    'results': ('data/results.csv', ['result_id', 'contest_id', 'match_id', 'user_id', 'team_id', 'total_points', 'rank', 'prize_amount', 'created_at']),
+    'hall_of_fame': ('data/hall_of_fame.csv', ['user_id', 'username', 'wins', 'podiums', 'total_prize_money', 'contests_entered', 'best_score', 'best_contest']),
+    'fixtures': ('data/fixtures.csv', ['match_id', 'match_no', 'team1', 'team2', 'time', 'day', 'status']),
+    'performances': ('data/performances.csv', ['performance_id', 'match_id', 'player_name', 'team_name', 'runs', 'balls_faced', 'fours', 'sixes', 'wickets', 'overs_bowled', 'runs_conceded', 'catches', 'stumpings', 'run_outs', 'total_points'])
+}
+
+# {file path: {'version': file version, 'df': parsed frame}}
+_table_cache = {}
+_cache_lock = threading.Lock()
+
+def create_empty_dataframe(columns):
+    """Create an empty DataFrame with specified columns"""
+    return pd.DataFrame(columns=columns)
+
+def safe_read_csv(file_path, default_columns):
+    """Safely read CSV file with proper error handling"""
+    try:
+        # Check if file exists and has content
+        if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
+            df = pd.read_csv(file_path)
+            # Check if DataFrame is empty or has wrong columns
+            if df.empty or not all(col in df.columns for col in default_columns):
+                return create_empty_dataframe(default_columns)
+            return df
+        else:
+            return create_empty_dataframe(default_columns)
+    except (pd.errors.EmptyDataError, pd.errors.ParserError, Exception) as e:
+        print(f"Error reading {file_path}: {e}")
+        return create_empty_dataframe(default_columns)
+
+def _csv_version(file_path):
+    """Get a cheap change marker for a data file"""
+    try:
+        stat = os.stat(file_path)
+        # The inode changes when a file is atomically replaced rather than appended to
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    except OSError:
+        return None
+
+def _csv_write(file_path, df):
+    """Write a table atomically so readers never see a partial file"""
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    temp_file = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    df.to_csv(temp_file, index=False)
+    os.replace(temp_file, file_path)
+
+def _csv_append(file_path, df):
+    """Append rows to a table, writing the header if the file is new"""
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    write_header = not _csv_exists(file_path)
+    df.to_csv(file_path, mode='a', header=write_header, index=False)
+
+def _csv_read_appended(file_path, columns, old_version, new_version):
+    """Read the rows appended between two versions, or None if the file was not just appended to"""
+    if old_version is None or new_version is None or old_version[2] != new_version[2]:
+        return None
+    start, end = old_version[1], new_version[1]
+    if not 0 < start < end:
+        return None
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        # Bytes past the newer size may be a row still being appended
+        appended = f.read(end - start)
+    return pd.read_csv(io.BytesIO(appended), names=columns, header=None)
+
+def _csv_exists(file_path):
+    """Check whether a data file exists and has content"""
+    return os.path.exists(file_path) and os.path.getsize(file_path) > 0
+
+def _csv_read_header(file_path):
+    """Get a data file's column names, or None when it is missing or empty"""
+    if not _csv_exists(file_path):
+        return None
+    # Only the header line is read, so this stays cheap for large tables
+    with open(file_path) as f:
+        return f.readline().strip().split(',')
+
+_path_locks = {}
+_path_locks_guard = threading.Lock()
+
+@contextmanager
+def _csv_lock(file_path):
+    """Hold an exclusive lock on a data file across threads and processes"""
+    with _path_locks_guard:
+        thread_lock = _path_locks.setdefault(file_path, threading.Lock())
+    with thread_lock:
+        if fcntl is None:
+            yield
+            return
+        # A sidecar file, because the data file itself is replaced on every write
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(f"{file_path}.lock", 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+_backend = {
+    'read': safe_read_csv,
+    'write': _csv_write,
+    'version': _csv_version,
+    'append': _csv_append,
+    'read_appended': _csv_read_appended,
+    'exists': _csv_exists,
+    'read_header': _csv_read_header,
+    'lock': _csv_lock
+}
+
+def set_backend(read=None, write=None, version=None, append=None, read_appended=None, exists=None, read_header=None, lock=None):
+    """Replace the storage functions used for every table and drop cached frames"""
+    functions = {
+        'read': read,
+        'write': write,
+        'version': version,
+        'append': append,
+        'read_appended': read_appended,
+        'exists': exists,
+        'read_header': read_header,
+        'lock': lock
+    }
+    _backend.update({key: function for key, function in functions.items() if function is not None})
+    with _cache_lock:
+        _table_cache.clear()
+
+def _resolve_path(path_or_name):
+    """Get the file for a table name or a data file path"""
+    return TABLES[path_or_name][0] if path_or_name in TABLES else path_or_name
+
+def ensure_table(name):
+    """Create a missing table with its header, or add columns missing from its header"""
+    path, columns = TABLES[name]
+    header = _backend['read_header'](path)
+    if header is None:
+        write_file(path, create_empty_dataframe(columns))
+        return 'created'
+    
+    missing = [col for col in columns if col not in header]
+    if not missing:
+        return 'ok'
+    
+    # Rare schema upgrade: keep every existing row and append the new columns
+    df = _backend['read'](path, header)
+    for col in missing:
+        df[col] = None
+    write_file(path, df)
+    return 'migrated'
+
+def table_path(name):
+    """Get the file backing a table"""
+    return TABLES[name][0]
+
+def table_columns(name):
+    """Get the expected columns of a table"""
+    return list(TABLES[name][1])
+
+def file_version(path_or_name):
+    """Get the change marker for a table name or a data file path"""
+    return _backend['version'](_resolve_path(path_or_name))
+
+def table_lock(path_or_name):
+    """Lock a table or data file for a read-modify-write, across processes"""
+    return _backend['lock'](_resolve_path(path_or_name))
+
+def file_exists(path_or_name):
+    """Check whether a table or data file exists and has content"""
+    return _backend['exists'](_resolve_path(path_or_name))
+
+def read_file(path, columns):
+    """Read a data file, reusing the parsed frame until it changes on disk"""
+    version = _backend['version'](path)
+    with _cache_lock:
+        cached = _table_cache.get(path)
+        if cached is not None and version is not None and cached['version'] == version:
+            instrumentation.record_cache_hit(path, len(cached['df']))
+            return cached['df'].copy()
+    
+    df = _backend['read'](path, columns)
+    instrumentation.record_file_parse(path, len(df))
+    with _cache_lock:
+        _table_cache[path] = {'version': version, 'df': df}
+    # Callers filter and mutate freely, so they never get the cached frame itself
+    return df.copy()
+
+def write_file(path, df):
+    """Replace a data file's contents and drop its cached frame"""
+    _backend['write'](path, df)
+    # Reparsed on the next read so cached dtypes always match the file
+    with _cache_lock:
+        _table_cache.pop(path, None)
+
+def read_table(name):
+    """Read a named table through the cache"""
+    path, columns = TABLES[name]
+    return read_file(path, columns)
+
+def write_table(name, df):
+    """Replace a named table's contents"""
+    write_file(TABLES[name][0], df)
+
+def append_table(name, df):
+    """Append rows to a named table without rewriting it"""
+    path = TABLES[name][0]
+    _backend['append'](path, df)
+    with _cache_lock:
+        _table_cache.pop(path, None)
+
+def read_appended(name, old_version, new_version):
+    """Read rows appended to a named table between two versions, or None if it changed otherwise"""
+    path, columns = TABLES[name]
+    df = _backend['read_appended'](path, columns, old_version, new_version)
+    if df is not None:
+        instrumentation.record_file_parse(path, len(df))
+    return df
+
+def invalidate_table(name):
+    """Drop a table's cached frame after it was changed outside write_table"""
+    with _cache_lock:
+        _table_cache.pop(TABLES[name][0], None)
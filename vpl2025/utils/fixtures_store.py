@@ -0,0 +1,106 @@
+import pandas as pd
+from utils.constants import FIXTURES_DATA
+from utils import change_feed
+from utils.data_store import table_path, table_columns, file_version, file_exists, read_table, write_table
+
+# Fixtures live in data/fixtures.csv, seeded from FIXTURES_DATA on first use.
+# Each process keeps indexes by match_id, status and day, rebuilt whenever the
+# file changes on disk, so status changes made by any server process show up.
+FIXTURES_FILE = table_path('fixtures')
+FIXTURE_COLUMNS = table_columns('fixtures')
+FIXTURE_STATUSES = ['upcoming', 'live', 'completed']
+
+_fixture_index = {
+    'version': None,
+    'all': [],
+    'by_id': {},
+    'by_status': {},
+    'by_day': {}
+}
+
+def initialize_fixtures_file():
+    """Create the fixtures table from the seed schedule if it does not exist"""
+    if file_exists('fixtures'):
+        return
+    seed = pd.DataFrame([{
+        'match_id': f['match_id'],
+        'match_no': f['match_no'],
+        'team1': f['teams'][0],
+        'team2': f['teams'][1],
+        'time': f['time'],
+        'day': f['day'],
+        'status': f['status']
+    } for f in FIXTURES_DATA], columns=FIXTURE_COLUMNS)
+    write_table('fixtures', seed)
+
+def _load_index():
+    """Rebuild the fixture indexes if the table changed since the last load"""
+    version = file_version('fixtures')
+    if version is None:
+        initialize_fixtures_file()
+        version = file_version('fixtures')
+    
+    if _fixture_index['version'] != version:
+        fixtures_df = read_table('fixtures').sort_values('match_no', kind='stable')
+        fixtures = [{
+            'match_id': row['match_id'],
+            'match_no': int(row['match_no']),
+            'teams': [row['team1'], row['team2']],
+            'time': row['time'],
+            'day': row['day'],
+            'status': row['status']
+        } for row in fixtures_df.to_dict('records')]
+        
+        by_status = {status: [] for status in FIXTURE_STATUSES}
+        by_day = {}
+        for fixture in fixtures:
+            by_status.setdefault(fixture['status'], []).append(fixture)
+            by_day.setdefault(fixture['day'], []).append(fixture)
+        
+        _fixture_index['all'] = fixtures
+        _fixture_index['by_id'] = {fixture['match_id']: fixture for fixture in fixtures}
+        _fixture_index['by_status'] = by_status
+        _fixture_index['by_day'] = by_day
+        _fixture_index['version'] = version
+    return _fixture_index
+
+def get_fixtures(status=None, day=None):
+    """Get fixtures in match order, optionally filtered by status and day"""
+    index = _load_index()
+    if status is None and day is None:
+        return list(index['all'])
+    if day is None:
+        return list(index['by_status'].get(status, []))
+    fixtures = index['by_day'].get(day, [])
+    if status is not None:
+        fixtures = [f for f in fixtures if f['status'] == status]
+    return list(fixtures)
+
+def get_fixture(match_id):
+    """Get a single fixture by match_id"""
+    return _load_index()['by_id'].get(match_id)
+
+def get_fixture_counts():
+    """Get the number of fixtures per status"""
+    index = _load_index()
+    return {status: len(fixtures) for status, fixtures in index['by_status'].items()}
+
+def update_fixture_status(match_id, new_status):
+    """Persist a fixture status change"""
+    try:
+        _load_index()
+        fixtures_df = read_table('fixtures')
+        match_mask = fixtures_df['match_id'] == match_id
+        if not match_mask.any():
+            return False
+        
+        old_status = fixtures_df.loc[match_mask, 'status'].iloc[0]
+        fixtures_df.loc[match_mask, 'status'] = new_status
+        write_table('fixtures', fixtures_df)
+        _fixture_index['version'] = None
+        
+        change_feed.publish('fixture_status_changed', match_id=match_id, old_status=old_status, status=new_status)
+        return True
+    except Exception as e:
+        print(f"Error updating fixture status: {e}")
+        return False
@@ -0,0 +1,267 @@
+import os
+import hmac
+import asyncio
+import json
+import threading
+import urllib.request
+import urllib.error
+import pandas as pd
+from utils.scorecard import validate_scorecard
+from utils.fixtures_store import get_fixture
+from utils.scoring import calculate_player_points_vectorized
+from utils.rescoring_worker import request_rescore
+from utils.data_manager import save_performances_bulk
+
+# Scorer devices on the LAN POST cumulative player stats to /scores:
+#   {"match_id": "M001", "player_name": "Sham", "runs": 12, "balls_faced": 9, ...}
+# or a list of such objects. Updates are validated on arrival, queued, and
+# flushed every FLUSH_INTERVAL_MS as one bulk write per match, matches in
+# parallel, with rescoring handed to the match's background worker so bursts
+# collapse into one run. Only live matches take updates, so results frozen
+# when a match completes are never rescored.
+# Posts change prize payouts, so every request must carry the shared secret
+# from VPL_INGEST_TOKEN in the X-VPL-Ingest-Token header, and the service binds
+# to loopback unless VPL_INGEST_HOST opens it to the LAN.
+INGEST_HOST = os.environ.get('VPL_INGEST_HOST', '127.0.0.1')
+INGEST_PORT = 8765
+INGEST_TOKEN = os.environ.get('VPL_INGEST_TOKEN')
+INGEST_TOKEN_HEADER = 'X-VPL-Ingest-Token'
+FLUSH_INTERVAL_MS = 500
+MAX_BODY_BYTES = 1024 * 1024
+
+HTTP_REASONS = {
+    200: 'OK', 202: 'Accepted', 400: 'Bad Request', 401: 'Unauthorized',
+    404: 'Not Found', 409: 'Conflict', 413: 'Payload Too Large'
+}
+
+# Latest queued update per (match_id, player_name) plus counters for /health
+_ingest_state = {
+    'pending': {},
+    'received': 0,
+    'flushed': 0,
+    'batches': 0,
+    'thread': None
+}
+
+def _require_token():
+    """Refuse to run the service without a shared secret"""
+    if not INGEST_TOKEN:
+        raise RuntimeError("Set VPL_INGEST_TOKEN before starting the score ingest service")
+
+def _is_authorized(headers):
+    """Check a request's token header against the shared secret"""
+    token = headers.get(INGEST_TOKEN_HEADER.lower(), '')
+    return bool(INGEST_TOKEN) and hmac.compare_digest(token.encode(), INGEST_TOKEN.encode())
+
+def _is_live(match_id):
+    """Check whether a match is currently live"""
+    fixture = get_fixture(match_id)
+    return fixture is not None and fixture['status'] == 'live'
+
+def get_closed_matches(updates):
+    """Get the known matches in score updates that are not live, in order"""
+    if isinstance(updates, dict):
+        updates = [updates]
+    if not isinstance(updates, list):
+        return []
+    match_ids = dict.fromkeys(update.get('match_id') for update in updates if isinstance(update, dict))
+    # Unknown match ids are reported by validation instead
+    return [match_id for match_id in match_ids if get_fixture(match_id) is not None and not _is_live(match_id)]
+
+def validate_updates(updates):
+    """Validate score updates against fixtures and squads, returning (valid_rows, errors)"""
+    if isinstance(updates, dict):
+        updates = [updates]
+    if not isinstance(updates, list) or not updates:
+        return [], ["Expected a score update object or a list of them"]
+    
+    updates_df = pd.DataFrame(updates)
+    if 'match_id' not in updates_df.columns:
+        return [], ["Every update needs a match_id"]
+    
+    valid_rows = []
+    errors = []
+    for match_id, match_updates in updates_df.groupby('match_id'):
+        valid, match_errors = validate_scorecard(match_updates.drop(columns='match_id'), match_id)
+        errors.extend(f"{match_id}: {error}" for error in match_errors)
+        for record in valid.to_dict('records'):
+            record['match_id'] = match_id
+            valid_rows.append(record)
+    return valid_rows, errors
+
+def queue_updates(updates):
+    """Validate and queue score updates for the next flush, returning (queued_count, errors)"""
+    valid_rows, errors = validate_updates(updates)
+    if errors:
+        return 0, errors
+    
+    for row in valid_rows:
+        _ingest_state['pending'][(row['match_id'], row['player_name'])] = row
+    _ingest_state['received'] += len(valid_rows)
+    return len(valid_rows), []
+
+def flush_match_updates(match_id, match_rows):
+    """Score and save one match's queued updates with one write and one rescoring request"""
+    # The match may have completed while these updates were queued
+    if not _is_live(match_id):
+        print(f"Dropping {len(match_rows)} updates for match {match_id}, which is no longer live")
+        return 0
+    
+    match_rows = match_rows.drop(columns='match_id').reset_index(drop=True)
+    match_rows['total_points'] = calculate_player_points_vectorized(match_rows)
+    if save_performances_bulk(match_id, match_rows):
+        request_rescore(match_id)
+        return len(match_rows)
+    print(f"Error flushing {len(match_rows)} updates for match {match_id}")
+    return 0
+
+def flush_updates(rows):
+    """Score and save queued updates with one write and one rescoring request per match"""
+    if not rows:
+        return 0
+    
+    rows_df = pd.DataFrame(rows)
+    return sum(flush_match_updates(match_id, match_rows) for match_id, match_rows in rows_df.groupby('match_id'))
+
+async def _flush_loop(flush_interval_ms):
+    """Flush the pending queue on a fixed interval"""
+    while True:
+        await asyncio.sleep(flush_interval_ms / 1000)
+        if not _ingest_state['pending']:
+            continue
+        
+        # Swap the queue so new updates keep arriving during the write
+        batch = list(_ingest_state['pending'].values())
+        _ingest_state['pending'] = {}
+        try:
+            # Matches write separate partitions under separate locks, so flush them concurrently
+            rows_df = pd.DataFrame(batch)
+            flushed = await asyncio.gather(*(
+                asyncio.to_thread(flush_match_updates, match_id, match_rows)
+                for match_id, match_rows in rows_df.groupby('match_id')
+            ))
+            _ingest_state['flushed'] += sum(flushed)
+            _ingest_state['batches'] += 1
+        except Exception as e:
+            print(f"Error flushing score updates: {e}")
+
+def _route(method, path, body, authorized=False):
+    """Dispatch a request and return (status, payload)"""
+    if method == 'GET' and path == '/health':
+        return 200, {
+            'status': 'ok',
+            'pending': len(_ingest_state['pending']),
+            'received': _ingest_state['received'],
+            'flushed': _ingest_state['flushed'],
+            'batches': _ingest_state['batches']
+        }
+    
+    if method == 'POST' and path == '/scores':
+        if not authorized:
+            return 401, {'errors': ["Missing or invalid ingest token"]}
+        try:
+            updates = json.loads(body or b'null')
+        except json.JSONDecodeError as e:
+            return 400, {'errors': [f"Invalid JSON: {e}"]}
+        closed_matches = get_closed_matches(updates)
+        if closed_matches:
+            return 409, {'errors': [f"Match {match_id} is not live" for match_id in closed_matches]}
+        queued, errors = queue_updates(updates)
+        if errors:
+            return 400, {'errors': errors}
+        return 202, {'queued': queued}
+    
+    return 404, {'errors': [f"No route for {method} {path}"]}
+
+async def _handle_connection(reader, writer):
+    """Serve one HTTP/1.1 request on a connection"""
+    try:
+        request_line = (await reader.readline()).decode('latin-1').strip()
+        method, path = request_line.split(' ')[:2]
+        
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            headers[key.strip().lower()] = value.strip()
+        
+        content_length = int(headers.get('content-length', 0))
+        if content_length > MAX_BODY_BYTES:
+            status, payload = 413, {'errors': ["Request body too large"]}
+        else:
+            body = await reader.readexactly(content_length) if content_length else b''
+            status, payload = _route(method, path.split('?')[0], body, _is_authorized(headers))
+    except Exception as e:
+        status, payload = 400, {'errors': [f"Malformed request: {e}"]}
+    
+    response = json.dumps(payload, default=str).encode()
+    writer.write(
+        f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(response)}\r\n"
+        f"Connection: close\r\n\r\n".encode() + response
+    )
+    try:
+        await writer.drain()
+    finally:
+        writer.close()
+
+async def serve(host=INGEST_HOST, port=INGEST_PORT, flush_interval_ms=FLUSH_INTERVAL_MS):
+    """Run the ingest HTTP server and flush loop until cancelled"""
+    _require_token()
+    server = await asyncio.start_server(_handle_connection, host, port)
+    flush_task = asyncio.create_task(_flush_loop(flush_interval_ms))
+    print(f"Score ingest service listening on {host}:{port}, flushing every {flush_interval_ms} ms")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        flush_task.cancel()
+
+def start_background_ingest_service(host=INGEST_HOST, port=INGEST_PORT, flush_interval_ms=FLUSH_INTERVAL_MS):
+    """Start the ingest service on a daemon thread inside this process, once"""
+    thread = _ingest_state['thread']
+    if thread is not None and thread.is_alive():
+        return thread
+    _require_token()
+    
+    # Sharing the app process means its caches and change feed see every flush
+    thread = threading.Thread(
+        target=lambda: asyncio.run(serve(host, port, flush_interval_ms)),
+        name='score-ingest',
+        daemon=True
+    )
+    thread.start()
+    _ingest_state['thread'] = thread
+    return thread
+
+def send_score_updates(updates, host='127.0.0.1', port=INGEST_PORT, timeout=5, token=None):
+    """Post score updates to a running ingest service, returning (status, payload)"""
+    request = urllib.request.Request(
+        f"http://{host}:{port}/scores",
+        data=json.dumps(updates).encode(),
+        headers={'Content-Type': 'application/json', INGEST_TOKEN_HEADER: token or INGEST_TOKEN or ''},
+        method='POST'
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b'{}')
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="VPL score ingest service")
+    parser.add_argument('--host', default=INGEST_HOST)
+    parser.add_argument('--port', type=int, default=INGEST_PORT)
+    parser.add_argument('--flush-ms', type=int, default=FLUSH_INTERVAL_MS)
+    args = parser.parse_args()
+    
+    try:
+        _require_token()
+    except RuntimeError as e:
+        parser.exit(1, f"{e}\n")
+    asyncio.run(serve(args.host, args.port, args.flush_ms))
@@ -0,0 +1,232 @@
+import os
+import json
+import math
+import time
+import threading
+import functools
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+# Lightweight timing for reruns. Each page runs its script inside page_run(),
+# heavy blocks use section(), and data_manager/scoring functions are wrapped
+# with @timed. data_store reports every file parse and cache hit, so each rerun
+# records its wall time, rows read, files parsed and cache hits, plus how it
+# exited: reruns cut short by st.stop(), st.switch_page()/st.rerun() or an
+# exception are kept too, flagged by their 'exit'. Recent samples are kept per
+# page, section and function for the Admin performance tab, and with
+# VPL_METRICS_FILE set every rerun is also appended to that file as one JSON line.
+INSTRUMENTATION_ENABLED = os.environ.get('VPL_INSTRUMENTATION', '1') != '0'
+METRICS_FILE = os.environ.get('VPL_METRICS_FILE')
+MAX_SAMPLES = 1000  # Per page, section or function
+MAX_RERUNS = 500
+
+# Streamlit's control-flow exceptions, by class name so this module does not import streamlit
+EXIT_REASONS = {'StopException': 'stop', 'RerunException': 'rerun'}
+
+_metrics = {
+    'samples': {},
+    'reruns': deque(maxlen=MAX_RERUNS)
+}
+_metrics_lock = threading.Lock()
+# The rerun being recorded on this script thread, if any
+_current = threading.local()
+
+def set_enabled(enabled):
+    """Turn recording on or off for this process"""
+    global INSTRUMENTATION_ENABLED
+    INSTRUMENTATION_ENABLED = bool(enabled)
+
+def _new_counters():
+    """Get a zeroed set of data-access counters"""
+    return {'rows_read': 0, 'files_parsed': 0, 'cache_hits': 0}
+
+def _record_sample(kind, name, duration_ms, counters):
+    """Keep one timing sample for a page, section or function"""
+    with _metrics_lock:
+        samples = _metrics['samples'].setdefault((kind, name), deque(maxlen=MAX_SAMPLES))
+        samples.append((duration_ms, counters['rows_read'], counters['files_parsed'], counters['cache_hits']))
+
+def _active_counters():
+    """Get the counters of every open rerun, section and function on this thread"""
+    return getattr(_current, 'stack', [])
+
+def record_file_parse(path, rows):
+    """Count a data file parsed from disk"""
+    for frame in _active_counters():
+        frame['files_parsed'] += 1
+        frame['rows_read'] += rows
+
+def record_cache_hit(path, rows):
+    """Count a data read served from an in-memory cache"""
+    for frame in _active_counters():
+        frame['cache_hits'] += 1
+        frame['rows_read'] += rows
+
+def _push():
+    """Open a counter frame on this thread"""
+    if not hasattr(_current, 'stack'):
+        _current.stack = []
+    frame = _new_counters()
+    _current.stack.append(frame)
+    return frame
+
+def _pop(frame):
+    """Close a counter frame on this thread"""
+    # Frames compare equal by value, so match on identity
+    stack = _current.stack
+    for i in range(len(stack) - 1, -1, -1):
+        if stack[i] is frame:
+            del stack[i]
+            break
+
+def begin_page(page):
+    """Start recording a page rerun on this script thread"""
+    if not INSTRUMENTATION_ENABLED:
+        return
+    # Drop anything a previous rerun on this thread left open
+    _current.stack = []
+    _current.page = page
+    _current.sections = []
+    _current.started = time.perf_counter()
+    _current.page_frame = _push()
+
+def end_page(exit_reason='completed'):
+    """Finish the page rerun started on this thread and store its record"""
+    page = getattr(_current, 'page', None)
+    if not INSTRUMENTATION_ENABLED or page is None:
+        return
+    duration_ms = (time.perf_counter() - _current.started) * 1000
+    counters = _current.page_frame
+    _pop(counters)
+    _record_sample('page', page, duration_ms, counters)
+    
+    rerun = {
+        'timestamp': datetime.now().isoformat(),
+        'page': page,
+        'duration_ms': round(duration_ms, 3),
+        'exit': exit_reason,
+        **counters,
+        'sections': _current.sections
+    }
+    with _metrics_lock:
+        _metrics['reruns'].append(rerun)
+    if METRICS_FILE:
+        _append_jsonl(METRICS_FILE, [rerun])
+    _current.page = None
+
+@contextmanager
+def page_run(page):
+    """Record a whole page rerun, including one that stops, switches page or fails part way"""
+    # Pages run their script body inside this block, and @st.fragment functions
+    # are decorated with it (as "<Page>:<fragment>") so their own reruns, which
+    # skip the page body, are recorded too. Inside a full page rerun a fragment
+    # only counts as a section of that rerun.
+    if INSTRUMENTATION_ENABLED and getattr(_current, 'page', None) is not None:
+        with section(page):
+            yield
+        return
+    begin_page(page)
+    exit_reason = 'completed'
+    try:
+        yield
+    except BaseException as e:
+        exit_reason = EXIT_REASONS.get(type(e).__name__, 'error')
+        raise
+    finally:
+        end_page(exit_reason)
+
+@contextmanager
+def section(name):
+    """Time a block of a page and count the data it reads"""
+    if not INSTRUMENTATION_ENABLED:
+        yield
+        return
+    page = getattr(_current, 'page', None)
+    label = f"{page}: {name}" if page else name
+    frame = _push()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+        _pop(frame)
+        _record_sample('section', label, duration_ms, frame)
+        if page:
+            _current.sections.append({'section': name, 'duration_ms': round(duration_ms, 3), **frame})
+
+def timed(func):
+    """Record wall time and data reads for every call of a function"""
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not INSTRUMENTATION_ENABLED:
+            return func(*args, **kwargs)
+        frame = _push()
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            _pop(frame)
+            _record_sample('function', name, duration_ms, frame)
+    return wrapper
+
+def _percentile(sorted_values, fraction):
+    """Get a nearest-rank percentile from sorted values"""
+    rank = math.ceil(fraction * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+def get_stats(kind=None):
+    """Get p50/p95 timings and average data-access counts per page, section or function"""
+    with _metrics_lock:
+        snapshot = {key: list(samples) for key, samples in _metrics['samples'].items()}
+    
+    stats = []
+    for (sample_kind, name), samples in snapshot.items():
+        if kind is not None and sample_kind != kind:
+            continue
+        durations = sorted(sample[0] for sample in samples)
+        calls = len(samples)
+        stats.append({
+            'kind': sample_kind,
+            'name': name,
+            'calls': calls,
+            'p50_ms': round(_percentile(durations, 0.5), 3),
+            'p95_ms': round(_percentile(durations, 0.95), 3),
+            'max_ms': round(durations[-1], 3),
+            'total_ms': round(sum(durations), 3),
+            'avg_rows_read': round(sum(sample[1] for sample in samples) / calls, 1),
+            'avg_files_parsed': round(sum(sample[2] for sample in samples) / calls, 2),
+            'avg_cache_hits': round(sum(sample[3] for sample in samples) / calls, 2)
+        })
+    return sorted(stats, key=lambda row: row['total_ms'], reverse=True)
+
+def get_recent_reruns(limit=50):
+    """Get the most recent rerun records, newest first"""
+    with _metrics_lock:
+        reruns = list(_metrics['reruns'])
+    return reruns[::-1][:limit]
+
+def reset_metrics():
+    """Forget every recorded sample and rerun"""
+    with _metrics_lock:
+        _metrics['samples'].clear()
+        _metrics['reruns'].clear()
+
+def _append_jsonl(path, records):
+    """Append records to a JSON-lines file"""
+    try:
+        with _metrics_lock:
+            with open(path, 'a') as f:
+                for record in records:
+                    f.write(json.dumps(record, default=str) + '\n')
+    except OSError as e:
+        print(f"Error writing metrics to {path}: {e}")
+
+def export_reruns_jsonl():
+    """Get every retained rerun record as JSON-lines text"""
+    with _metrics_lock:
+        reruns = list(_metrics['reruns'])
+    return ''.join(json.dumps(rerun, default=str) + '\n' for rerun in reruns)
@@ -0,0 +1,110 @@
+from utils import change_feed
+from utils.fixtures_store import get_fixture, update_fixture_status
+from utils.data_manager import get_contests, update_contest_status, finalize_contest, get_leaderboards
+from utils.scoring import update_all_team_points, cache_match_scoring_index, drop_match_scoring_index
+
+# Allowed match status transitions. Hooks registered on a transition run in
+# registration order at the transition, so expensive work happens once instead
+# of on every page view. The new status is only saved after every hook has
+# succeeded, so a failed transition leaves the match where it was and can be
+# run again; hooks are written to be safe to repeat.
+MATCH_TRANSITIONS = {
+    'upcoming': ['live'],
+    'live': ['completed']
+}
+
+_transition_hooks = {}
+
+def register_transition_hook(from_status, to_status, hook):
+    """Register a hook(match_id) to run when a match moves between two statuses"""
+    if to_status not in MATCH_TRANSITIONS.get(from_status, []):
+        raise ValueError(f"Unknown match transition {from_status} -> {to_status}")
+    _transition_hooks.setdefault((from_status, to_status), []).append(hook)
+    return hook
+
+def on_transition(from_status, to_status):
+    """Decorator form of register_transition_hook"""
+    def decorator(hook):
+        return register_transition_hook(from_status, to_status, hook)
+    return decorator
+
+def transition_match(match_id, new_status):
+    """Move a match to a new status and run its hooks, returning (success, messages)"""
+    fixture = get_fixture(match_id)
+    if fixture is None:
+        return False, [f"Unknown match {match_id}"]
+    
+    old_status = fixture['status']
+    if new_status not in MATCH_TRANSITIONS.get(old_status, []):
+        return False, [f"Match {fixture['match_no']} cannot go from {old_status} to {new_status}"]
+    
+    messages = []
+    for hook in _transition_hooks.get((old_status, new_status), []):
+        try:
+            message = hook(match_id)
+            if message:
+                messages.append(message)
+        except Exception as e:
+            # Later hooks depend on earlier ones, so stop at the first failure and keep the old status
+            print(f"Error in {hook.__name__} for match {match_id}: {e}")
+            messages.append(f"{hook.__name__} failed: {e}")
+            return False, messages
+    
+    if not update_fixture_status(match_id, new_status):
+        messages.append("Error saving match status")
+        return False, messages
+    
+    change_feed.publish('match_transition_completed', match_id=match_id, old_status=old_status, status=new_status)
+    return True, messages
+
+def _match_contests(match_id, statuses):
+    """Get ids of contests on a match that are in one of the given statuses"""
+    contests_df = get_contests()
+    if contests_df.empty:
+        return []
+    match_contests = contests_df[(contests_df['match_id'] == match_id) & contests_df['status'].isin(statuses)]
+    return match_contests['contest_id'].tolist()
+
+@on_transition('upcoming', 'live')
+def lock_contest_entries(match_id):
+    """Close entries for every open contest on the match"""
+    contest_ids = _match_contests(match_id, ['active'])
+    for contest_id in contest_ids:
+        update_contest_status(contest_id, 'live')
+    return f"Locked entries for {len(contest_ids)} contest(s)"
+
+@on_transition('upcoming', 'live')
+def prepare_scoring_index(match_id):
+    """Precompute the player to teams index and sparse scoring matrix for the match"""
+    scoring_index = cache_match_scoring_index(match_id)
+    team_count = len(scoring_index['team_ids']) if scoring_index else 0
+    return f"Built scoring index for {team_count} team(s)"
+
+@on_transition('live', 'completed')
+def final_rescore(match_id):
+    """Score every team on the match from the final performances"""
+    if not update_all_team_points(match_id):
+        raise RuntimeError("Team points update failed")
+    return "Final team points calculated"
+
+@on_transition('live', 'completed')
+def finalize_contests(match_id):
+    """Complete every running contest on the match, recording results and Hall of Fame stats"""
+    contest_ids = _match_contests(match_id, ['active', 'live'])
+    for contest_id in contest_ids:
+        if not update_contest_status(contest_id, 'completed'):
+            raise RuntimeError(f"Could not complete contest {contest_id}")
+    
+    # A re-run also finishes contests completed before an earlier failure
+    for contest_id in _match_contests(match_id, ['completed']):
+        if not finalize_contest(contest_id):
+            raise RuntimeError(f"Could not record results for contest {contest_id}")
+    drop_match_scoring_index(match_id)
+    return f"Finalized {len(contest_ids)} contest(s)"
+
+@on_transition('live', 'completed')
+def warm_leaderboards(match_id):
+    """Build final leaderboards now so the first viewers read them from cache"""
+    contest_ids = _match_contests(match_id, ['completed'])
+    get_leaderboards(contest_ids)
+    return f"Cached {len(contest_ids)} leaderboard(s)"
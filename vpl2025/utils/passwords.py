@@ -0,0 +1,129 @@
+import os
+import hmac
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Passwords are hashed with a salted KDF from hashlib. The cost parameters are
+# stored inside each hash, so raising them only affects new hashes, and older
+# hashes (including the original unsalted SHA-256 ones) are upgraded on the
+# user's next successful login. Verification runs on a small bounded pool so
+# a login spike cannot pin every Streamlit script thread on KDF work.
+#
+# Hash formats:
+#   scrypt$n=16384,r=8,p=1$<salt hex>$<hash hex>
+#   pbkdf2_sha256$iterations=240000$<salt hex>$<hash hex>
+#   <64 hex chars>  (legacy unsalted SHA-256)
+PASSWORD_KDF = os.environ.get('VPL_PASSWORD_KDF', 'scrypt')
+KDF_PARAMS = {
+    'scrypt': {
+        'n': int(os.environ.get('VPL_SCRYPT_N', 2 ** 14)),
+        'r': int(os.environ.get('VPL_SCRYPT_R', 8)),
+        'p': int(os.environ.get('VPL_SCRYPT_P', 1))
+    },
+    'pbkdf2_sha256': {
+        'iterations': int(os.environ.get('VPL_PBKDF2_ITERATIONS', 240000))
+    }
+}
+SALT_BYTES = 16
+HASH_BYTES = 32
+VERIFY_WORKERS = int(os.environ.get('VPL_PASSWORD_WORKERS', min(4, os.cpu_count() or 1)))
+
+_verify_pool = ThreadPoolExecutor(max_workers=VERIFY_WORKERS, thread_name_prefix='password-verify')
+
+def _derive(kdf, params, password, salt):
+    """Run the KDF with the given cost parameters"""
+    if kdf == 'scrypt':
+        # scrypt needs 128 * n * r bytes of memory, leave headroom above that
+        maxmem = 256 * params['n'] * params['r']
+        return hashlib.scrypt(password.encode(), salt=salt, n=params['n'], r=params['r'], p=params['p'], maxmem=maxmem, dklen=HASH_BYTES)
+    if kdf == 'pbkdf2_sha256':
+        return hashlib.pbkdf2_hmac('sha256', password.encode(), salt, params['iterations'], dklen=HASH_BYTES)
+    raise ValueError(f"Unknown password KDF: {kdf}")
+
+def _parse_hash(stored_hash):
+    """Split a stored hash into (kdf, params, salt, digest), or None if it is not a KDF hash"""
+    parts = str(stored_hash).split('$')
+    if len(parts) != 4:
+        return None
+    kdf, param_text, salt_hex, digest_hex = parts
+    # Malformed parameters or hex raise ValueError, which callers treat as a bad hash
+    params = {key: int(value) for key, value in (item.split('=') for item in param_text.split(','))}
+    return kdf, params, bytes.fromhex(salt_hex), bytes.fromhex(digest_hex)
+
+def hash_password(password, kdf=None, params=None):
+    """Hash a password with a fresh salt and the configured (or given) KDF settings"""
+    kdf = kdf or PASSWORD_KDF
+    params = params or KDF_PARAMS[kdf]
+    salt = os.urandom(SALT_BYTES)
+    digest = _derive(kdf, params, password, salt)
+    param_text = ','.join(f"{key}={value}" for key, value in params.items())
+    return f"{kdf}${param_text}${salt.hex()}${digest.hex()}"
+
+def verify_password(password, stored_hash):
+    """Check a password against a stored hash of any supported format"""
+    try:
+        parsed = _parse_hash(stored_hash)
+        if parsed is None:
+            legacy = hashlib.sha256(password.encode()).hexdigest()
+            return hmac.compare_digest(legacy.encode(), str(stored_hash).encode())
+        kdf, params, salt, digest = parsed
+        return hmac.compare_digest(_derive(kdf, params, password, salt), digest)
+    except (ValueError, KeyError) as e:
+        # A corrupted stored hash rejects the login instead of crashing the page
+        print(f"Error verifying password: malformed stored hash ({e})")
+        return False
+
+def verify_password_pooled(password, stored_hash, timeout=None):
+    """Verify a password on the bounded verification pool"""
+    return _verify_pool.submit(verify_password, password, stored_hash).result(timeout=timeout)
+
+def needs_rehash(stored_hash):
+    """Check whether a stored hash uses something other than the current KDF settings"""
+    try:
+        parsed = _parse_hash(stored_hash)
+    except ValueError:
+        return True
+    if parsed is None:
+        return True
+    kdf, params, _, _ = parsed
+    return kdf != PASSWORD_KDF or params != KDF_PARAMS[PASSWORD_KDF]
+
+def benchmark_logins(settings, logins=200, workers=VERIFY_WORKERS):
+    """Measure verified logins per second for each (kdf, params) setting"""
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for kdf, params in settings:
+            stored_hash = hash_password('benchmark-password', kdf, params)
+            start = time.perf_counter()
+            verified = list(pool.map(lambda _: verify_password('benchmark-password', stored_hash), range(logins)))
+            elapsed = time.perf_counter() - start
+            results.append({
+                'kdf': kdf,
+                'params': params,
+                'workers': workers,
+                'logins': logins,
+                'seconds': round(elapsed, 3),
+                'logins_per_sec': round(logins / elapsed, 1),
+                'ms_per_login': round(elapsed / logins * workers * 1000, 2),
+                'all_verified': all(verified)
+            })
+    return results
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Benchmark password verification throughput per KDF cost setting")
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=VERIFY_WORKERS)
+    parser.add_argument('--scrypt-n', type=int, nargs='+', default=[2 ** 13, 2 ** 14, 2 ** 15])
+    parser.add_argument('--pbkdf2-iterations', type=int, nargs='+', default=[100000, 240000, 600000])
+    args = parser.parse_args()
+    
+    settings = [('scrypt', {'n': n, 'r': 8, 'p': 1}) for n in args.scrypt_n]
+    settings += [('pbkdf2_sha256', {'iterations': iterations}) for iterations in args.pbkdf2_iterations]
+    
+    print(f"{'kdf':<14} {'params':<28} {'logins/sec':>10} {'ms/login':>9}")
+    for result in benchmark_logins(settings, args.logins, args.workers):
+        params = ','.join(f"{key}={value}" for key, value in result['params'].items())
+        print(f"{result['kdf']:<14} {params:<28} {result['logins_per_sec']:>10} {result['ms_per_login']:>9}")
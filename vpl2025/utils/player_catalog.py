@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+from utils.constants import TEAMS_DATA
+
+# Player catalog built once at import from TEAMS_DATA. Players get a stable
+# integer player_id (their position in squad order), with parallel name, team
+# and price arrays, a name -> player_id reverse index, price statistics per
+# team and across the tournament, and orderings by price (highest first).
+TEAM_NAMES = list(TEAMS_DATA.keys())
+
+PLAYER_NAMES = np.array([player['name'] for team in TEAM_NAMES for player in TEAMS_DATA[team]['players']], dtype=object)
+PLAYER_TEAMS = np.array([team for team in TEAM_NAMES for _ in TEAMS_DATA[team]['players']], dtype=object)
+PLAYER_PRICES = np.array([player['price'] for team in TEAM_NAMES for player in TEAMS_DATA[team]['players']], dtype=np.int64)
+PLAYER_IDS = np.arange(len(PLAYER_NAMES))
+
+# Player names are unique across squads
+PLAYER_INDEX = {name: player_id for player_id, name in enumerate(PLAYER_NAMES)}
+TEAM_PLAYER_IDS = {team: PLAYER_IDS[PLAYER_TEAMS == team] for team in TEAM_NAMES}
+
+# Highest price first, squad order breaking ties
+PRICE_ORDER = np.argsort(-PLAYER_PRICES, kind='stable')
+TEAM_PRICE_ORDER = {team: PRICE_ORDER[PLAYER_TEAMS[PRICE_ORDER] == team] for team in TEAM_NAMES}
+
+def _price_stats(player_ids):
+    """Summarise prices for a set of players"""
+    prices = PLAYER_PRICES[player_ids]
+    most_expensive = player_ids[np.argmax(prices)]
+    cheapest = player_ids[np.argmin(prices)]
+    return {
+        'count': len(player_ids),
+        'max': int(prices.max()),
+        'min': int(prices.min()),
+        'avg': int(prices.sum() // len(prices)),
+        'total': int(prices.sum()),
+        'most_expensive': PLAYER_NAMES[most_expensive],
+        'cheapest': PLAYER_NAMES[cheapest]
+    }
+
+TEAM_PRICE_STATS = {team: _price_stats(TEAM_PLAYER_IDS[team]) for team in TEAM_NAMES}
+PRICE_STATS = _price_stats(PLAYER_IDS)
+
+PLAYERS_DF = pd.DataFrame({
+    'player_id': PLAYER_IDS,
+    'name': PLAYER_NAMES,
+    'team': PLAYER_TEAMS,
+    'price': PLAYER_PRICES
+})
+
+def get_player_team(player_name):
+    """Get the team a player belongs to, or None for an unknown name"""
+    player_id = PLAYER_INDEX.get(player_name)
+    return None if player_id is None else PLAYER_TEAMS[player_id]
+
+def get_player_price(player_name):
+    """Get a player's price, or None for an unknown name"""
+    player_id = PLAYER_INDEX.get(player_name)
+    return None if player_id is None else int(PLAYER_PRICES[player_id])
+
+def get_team_players(team_name):
+    """Get a team's players in squad order as (name, price) records"""
+    return [
+        {'name': PLAYER_NAMES[player_id], 'price': int(PLAYER_PRICES[player_id])}
+        for player_id in TEAM_PLAYER_IDS.get(team_name, [])
+    ]
+
+def get_squad_teams(team_names):
+    """Get a player name -> team mapping for the squads of the given teams"""
+    return {
+        PLAYER_NAMES[player_id]: team_name
+        for team_name in team_names
+        for player_id in TEAM_PLAYER_IDS.get(team_name, [])
+    }
+
+def get_players_by_price(team_name=None, top_n=None):
+    """Get players ordered by price (highest first), optionally for one team"""
+    order = PRICE_ORDER if team_name is None else TEAM_PRICE_ORDER.get(team_name, PRICE_ORDER[:0])
+    if top_n is not None:
+        order = order[:top_n]
+    return PLAYERS_DF.iloc[order].reset_index(drop=True)
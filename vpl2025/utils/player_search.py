@@ -0,0 +1,136 @@
+import re
+from utils import player_catalog
+
+# Player name search built once over the player catalog. A prefix trie over
+# whole names and over each name token answers as-you-type lookups ("vic"
+# finds "Vicky Jr", "M.Vicky" and "Vicky Rockers"), and a trigram index gives
+# ranked fuzzy matches for typos ("Rajadorai" -> "Rajadurai"). Results carry a
+# score in [0, 1]: exact names score 1, prefix matches just under, and fuzzy
+# matches their trigram similarity scaled below every prefix match.
+EXACT_SCORE = 1.0
+NAME_PREFIX_SCORE = 0.95
+TOKEN_PREFIX_SCORE = 0.9
+FUZZY_WEIGHT = 0.85
+MIN_FUZZY_SIMILARITY = 0.3
+
+# Name suggestions (e.g. for scorecard rows) only offer a clear, confident winner
+RESOLVE_MIN_SCORE = 0.35
+RESOLVE_MIN_MARGIN = 0.1
+
+def normalize_name(name):
+    """Lowercase a name and reduce punctuation and spacing to single spaces"""
+    return ' '.join(re.split(r'[^a-z0-9]+', str(name).lower())).strip()
+
+def _trigrams(text):
+    """Get the set of padded character trigrams of a normalized string"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _trie_insert(trie, key, player_id):
+    """Add a player id to every trie node along a key"""
+    node = trie
+    for char in key:
+        node = node['children'].setdefault(char, {'children': {}, 'ids': set()})
+        node['ids'].add(player_id)
+
+def _trie_lookup(trie, prefix):
+    """Get the ids of every key starting with a prefix"""
+    node = trie
+    for char in prefix:
+        node = node['children'].get(char)
+        if node is None:
+            return set()
+    return node['ids']
+
+def build_search_index(names):
+    """Build the tries and trigram index for a list of names (position = player id)"""
+    index = {
+        'names': list(names),
+        'normalized': [],
+        'name_trie': {'children': {}, 'ids': set()},
+        'token_trie': {'children': {}, 'ids': set()},
+        'trigrams': {},
+        'trigram_counts': []
+    }
+    for player_id, name in enumerate(index['names']):
+        normalized = normalize_name(name)
+        index['normalized'].append(normalized)
+        _trie_insert(index['name_trie'], normalized, player_id)
+        for token in normalized.split():
+            _trie_insert(index['token_trie'], token, player_id)
+        
+        grams = _trigrams(normalized)
+        index['trigram_counts'].append(len(grams))
+        for gram in grams:
+            index['trigrams'].setdefault(gram, set()).add(player_id)
+    return index
+
+def search_index(index, query, limit=10, allowed_ids=None):
+    """Get (player_id, score) pairs for a query, best first"""
+    normalized = normalize_name(query)
+    if not normalized:
+        return []
+    
+    scores = {}
+    
+    # Prefix matches: whole name, or every query token prefixing some name token
+    for player_id in _trie_lookup(index['name_trie'], normalized):
+        scores[player_id] = EXACT_SCORE if index['normalized'][player_id] == normalized else NAME_PREFIX_SCORE
+    token_ids = None
+    for token in normalized.split():
+        matches = _trie_lookup(index['token_trie'], token)
+        token_ids = set(matches) if token_ids is None else token_ids & matches
+    for player_id in token_ids or ():
+        scores.setdefault(player_id, TOKEN_PREFIX_SCORE)
+    
+    # Fuzzy matches: Jaccard similarity of trigram sets, counted via the index
+    query_grams = _trigrams(normalized)
+    shared = {}
+    for gram in query_grams:
+        for player_id in index['trigrams'].get(gram, ()):
+            shared[player_id] = shared.get(player_id, 0) + 1
+    for player_id, common in shared.items():
+        similarity = common / (len(query_grams) + index['trigram_counts'][player_id] - common)
+        if similarity >= MIN_FUZZY_SIMILARITY:
+            scores[player_id] = max(scores.get(player_id, 0), similarity * FUZZY_WEIGHT)
+    
+    if allowed_ids is not None:
+        scores = {player_id: score for player_id, score in scores.items() if player_id in allowed_ids}
+    
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], index['normalized'][item[0]]))
+    return ranked[:limit] if limit else ranked
+
+# Index over the whole catalog, player ids matching player_catalog.PLAYER_IDS
+PLAYER_SEARCH_INDEX = build_search_index(player_catalog.PLAYER_NAMES)
+
+def _team_player_ids(team_names):
+    """Get the set of player ids in the given teams"""
+    return {int(player_id) for team_name in team_names for player_id in player_catalog.TEAM_PLAYER_IDS.get(team_name, [])}
+
+def search_players(query, limit=10, team_names=None):
+    """Search players by name, optionally within some teams, as ranked records"""
+    allowed_ids = _team_player_ids(team_names) if team_names is not None else None
+    return [
+        {
+            'name': player_catalog.PLAYER_NAMES[player_id],
+            'team': player_catalog.PLAYER_TEAMS[player_id],
+            'price': int(player_catalog.PLAYER_PRICES[player_id]),
+            'score': round(score, 3)
+        }
+        for player_id, score in search_index(PLAYER_SEARCH_INDEX, query, limit, allowed_ids)
+    ]
+
+def suggest_player_name(name, team_names=None):
+    """Suggest the catalog name a possibly misspelt player name stands for, or None if unclear"""
+    if team_names is not None:
+        # A name that is exactly another squad's player is never offered as one of these squads'
+        best = search_players(name, limit=1)
+        if best and best[0]['score'] == EXACT_SCORE and best[0]['team'] not in team_names:
+            return None
+    
+    matches = search_players(name, limit=2, team_names=team_names)
+    if not matches or matches[0]['score'] < RESOLVE_MIN_SCORE:
+        return None
+    if matches[0]['score'] < EXACT_SCORE and len(matches) > 1 and matches[0]['score'] - matches[1]['score'] < RESOLVE_MIN_MARGIN:
+        return None
+    return matches[0]['name']
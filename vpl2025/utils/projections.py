@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+from utils.constants import INNINGS_OVERS
+from utils.fixtures_store import get_fixture
+from utils.scoring import CRICKET_SCORING_SYSTEM, calculate_player_points_vectorized, build_scoring_index, score_teams, _performance_column, _is_out_column
+
+# Simple rate models: a batter who is not out keeps facing the same share of
+# the remaining innings at their current strike rate, and a bowler keeps
+# bowling the same share of the remaining overs at their current wicket and
+# economy rates. Players yet to bat or bowl and fielding are not projected.
+
+def overs_to_balls(overs):
+    """Convert cricket overs notation (3.4 = 3 overs 4 balls) to balls"""
+    overs = np.asarray(overs, dtype=float)
+    whole_overs = np.floor(overs)
+    return whole_overs * 6 + np.round((overs - whole_overs) * 10)
+
+def project_player_stats(performances, teams):
+    """Extrapolate current player stats to the end of the match"""
+    projected = performances.copy()
+    innings_balls = INNINGS_OVERS * 6
+    
+    balls_faced = _performance_column(projected, 'balls_faced')
+    bowled_balls = overs_to_balls(_performance_column(projected, 'overs_bowled'))
+    is_out = _is_out_column(projected)
+    
+    # Balls each side has bowled so far; a side's batting progress is what the other side bowled
+    team_names = projected['team_name'].to_numpy()
+    bowled_by_team = {team: bowled_balls[team_names == team].sum() for team in teams}
+    opponent = {teams[0]: teams[1], teams[1]: teams[0]}
+    batting_progress = np.array([bowled_by_team.get(opponent.get(team), 0) for team in team_names], dtype=float)
+    bowling_progress = np.array([bowled_by_team.get(team, 0) for team in team_names], dtype=float)
+    
+    # Batting: same share of remaining balls at the current strike rate
+    remaining_batting = np.clip(innings_balls - batting_progress, 0, None)
+    batting_share = np.divide(balls_faced, batting_progress, out=np.zeros_like(balls_faced), where=batting_progress > 0)
+    extra_balls = np.where(is_out, 0, remaining_batting * batting_share)
+    batting_scale = np.divide(balls_faced + extra_balls, balls_faced, out=np.ones_like(balls_faced), where=balls_faced > 0)
+    
+    projected['runs'] = _performance_column(projected, 'runs') * batting_scale
+    projected['fours'] = _performance_column(projected, 'fours') * batting_scale
+    projected['sixes'] = _performance_column(projected, 'sixes') * batting_scale
+    projected['balls_faced'] = balls_faced + extra_balls
+    
+    # Bowling: same share of remaining overs at current wicket and economy rates
+    remaining_bowling = np.clip(innings_balls - bowling_progress, 0, None)
+    bowling_share = np.divide(bowled_balls, bowling_progress, out=np.zeros_like(bowled_balls), where=bowling_progress > 0)
+    extra_bowled = remaining_bowling * bowling_share
+    bowling_scale = np.divide(bowled_balls + extra_bowled, bowled_balls, out=np.ones_like(bowled_balls), where=bowled_balls > 0)
+    
+    projected['wickets'] = _performance_column(projected, 'wickets') * bowling_scale
+    projected['runs_conceded'] = _performance_column(projected, 'runs_conceded') * bowling_scale
+    projected['maidens'] = _performance_column(projected, 'maidens') * bowling_scale
+    projected['overs_bowled'] = (bowled_balls + extra_bowled) / 6
+    
+    return projected
+
+def project_match_points(match_id, performances=None):
+    """Get current and projected final points for every player in a match"""
+    from utils.data_manager import get_performances
+    
+    match_info = get_fixture(match_id)
+    if performances is None:
+        performances = get_performances(match_id)
+    if match_info is None or performances.empty:
+        return pd.DataFrame(columns=['player_name', 'team_name', 'current_points', 'projected_points'])
+    
+    performances = performances.reset_index(drop=True)
+    projected = project_player_stats(performances, match_info['teams'])
+    
+    # Current points are the stored ones the leaderboard uses; the rate model only adds the extrapolated part
+    scored_points = calculate_player_points_vectorized(performances).to_numpy(dtype=float)
+    current_points = scored_points
+    if 'total_points' in performances:
+        stored_points = pd.to_numeric(performances['total_points'], errors='coerce').to_numpy(dtype=float)
+        current_points = np.where(np.isnan(stored_points), scored_points, stored_points)
+    extra_points = calculate_player_points_vectorized(projected).to_numpy() - scored_points
+    return pd.DataFrame({
+        'player_name': performances['player_name'].to_numpy(),
+        'team_name': performances['team_name'].to_numpy(),
+        'current_points': current_points,
+        'projected_points': current_points + extra_points
+    })
+
+def project_contest_totals(match_id, performances=None):
+    """Get current and projected totals for every team in contests on a match"""
+    from utils.data_manager import get_all_teams, get_contests, get_username_map
+    
+    contests_df = get_contests()
+    teams_df = get_all_teams()
+    if contests_df.empty or teams_df.empty:
+        return pd.DataFrame()
+    
+    contest_ids = contests_df.loc[contests_df['match_id'] == match_id, 'contest_id']
+    match_teams = teams_df[teams_df['contest_id'].isin(contest_ids)].reset_index(drop=True)
+    if match_teams.empty:
+        return pd.DataFrame()
+    
+    player_points = project_match_points(match_id, performances).set_index('player_name')
+    
+    # Same sparse teams x players structure as scoring, one pass for all contests
+    scoring_index = build_scoring_index(match_teams)
+    # Picked players with no performance yet still get the playing-seven bonus
+    base_points = CRICKET_SCORING_SYSTEM['other']['playing_seven']
+    projected_by_player = player_points['projected_points'].reindex(scoring_index['player_names']).fillna(base_points).to_numpy()
+    
+    projections = match_teams[['team_id', 'user_id', 'contest_id', 'team_name', 'total_points']].copy()
+    projections['username'] = projections['user_id'].map(get_username_map())
+    projections['projected_points'] = score_teams(scoring_index, projected_by_player)
+    projections['projected_rank'] = projections.groupby('contest_id')['projected_points'].rank(method='min', ascending=False).astype(int)
+    return projections.sort_values(['contest_id', 'projected_rank']).reset_index(drop=True)
@@ -0,0 +1,101 @@
+import threading
+from datetime import datetime
+from utils import change_feed
+from utils.scoring import update_all_team_points
+
+# Each match being rescored gets its own background thread, so simultaneous
+# live matches score in parallel. Requests for a match that arrive before its
+# next run starts collapse into a single run, which then scores the latest
+# saved performances. Idle match workers exit after WORKER_IDLE_SECONDS.
+WORKER_IDLE_SECONDS = 60
+
+_worker_state = {
+    'pending': set(),
+    'status': {},
+    'threads': {}
+}
+_condition = threading.Condition()
+
+def _match_status(match_id):
+    """Get the status record for a match, creating it on first use"""
+    return _worker_state['status'].setdefault(match_id, {
+        'requested': 0,
+        'runs': 0,
+        'running': False,
+        'completed_version': None,
+        'completed_at': None,
+        'last_error': None
+    })
+
+def _ensure_worker(match_id):
+    """Start the rescoring thread for a match if it is not already running"""
+    thread = _worker_state['threads'].get(match_id)
+    if thread is None or not thread.is_alive():
+        thread = threading.Thread(target=_worker_loop, args=(match_id,), name=f'rescoring-worker-{match_id}', daemon=True)
+        thread.start()
+        _worker_state['threads'][match_id] = thread
+
+def request_rescore(match_id):
+    """Queue a rescoring run for a match and return immediately"""
+    with _condition:
+        _ensure_worker(match_id)
+        status = _match_status(match_id)
+        status['requested'] += 1
+        # Already pending requests for this match are absorbed into one run
+        _worker_state['pending'].add(match_id)
+        _condition.notify_all()
+        return status['requested']
+
+def get_rescore_status(match_id):
+    """Get a copy of the rescoring status for a match"""
+    with _condition:
+        status = dict(_match_status(match_id))
+        status['pending'] = match_id in _worker_state['pending']
+        return status
+
+def wait_for_rescore(match_id, timeout=None):
+    """Block until no rescoring run is pending or running for a match"""
+    with _condition:
+        return _condition.wait_for(
+            lambda: match_id not in _worker_state['pending'] and not _match_status(match_id)['running'],
+            timeout=timeout
+        )
+
+def get_active_workers():
+    """Get the match ids that currently have a rescoring thread"""
+    with _condition:
+        return [match_id for match_id, thread in _worker_state['threads'].items() if thread.is_alive()]
+
+def _worker_loop(match_id):
+    """Run queued rescoring requests for one match until it goes idle"""
+    while True:
+        with _condition:
+            if not _condition.wait_for(lambda: match_id in _worker_state['pending'], timeout=WORKER_IDLE_SECONDS):
+                # Retire under the lock so a new request starts a fresh thread
+                _worker_state['threads'].pop(match_id, None)
+                return
+            _worker_state['pending'].discard(match_id)
+            status = _match_status(match_id)
+            status['running'] = True
+        
+        # Every performance saved up to this version is included in the run
+        version = change_feed.get_version()
+        try:
+            succeeded = update_all_team_points(match_id)
+            error = None if succeeded else "Team points update failed"
+        except Exception as e:
+            succeeded = False
+            error = str(e)
+            print(f"Error rescoring match {match_id}: {e}")
+        
+        with _condition:
+            status['running'] = False
+            status['runs'] += 1
+            status['last_error'] = error
+            if succeeded:
+                status['completed_version'] = version
+                status['completed_at'] = datetime.now().isoformat()
+            _condition.notify_all()
+        
+        if succeeded:
+            change_feed.publish('rescore_completed', match_id=match_id, version=version)
@@ -0,0 +1,132 @@
+import io
+import json
+import pandas as pd
+from utils.player_catalog import get_squad_teams, get_player_team
+from utils.player_search import suggest_player_name
+from utils.fixtures_store import get_fixture
+from utils.scoring import calculate_player_points_vectorized, parse_is_out
+from utils.rescoring_worker import request_rescore
+from utils.data_manager import save_performances_bulk
+
+# Stat columns accepted in a scorecard, anything missing defaults to zero
+SCORECARD_STAT_COLUMNS = ['runs', 'balls_faced', 'fours', 'sixes', 'wickets', 'overs_bowled', 'runs_conceded', 'maidens', 'catches', 'stumpings', 'run_outs']
+
+def parse_scorecard(source, fmt='csv'):
+    """Parse a scorecard from CSV, JSON or a pasted table into a DataFrame"""
+    if isinstance(source, bytes):
+        source = source.decode('utf-8-sig')
+    
+    if fmt == 'json':
+        data = json.loads(source)
+        # Accept a list of rows or {"players": [...]}
+        if isinstance(data, dict):
+            data = data.get('players', [])
+        scorecard = pd.DataFrame(data)
+    elif fmt == 'table':
+        # Spreadsheet pastes are tab separated, hand typed tables use runs of spaces or pipes
+        separator = '\t' if '\t' in source else r'\s*\|\s*|\s{2,}'
+        scorecard = pd.read_csv(io.StringIO(source.strip()), sep=separator, engine='python')
+        scorecard = scorecard.dropna(axis=1, how='all')
+    else:
+        scorecard = pd.read_csv(io.StringIO(source))
+    
+    # Normalise headers such as "Player Name" or "Balls Faced"
+    scorecard.columns = [str(col).strip().lower().replace(' ', '_') for col in scorecard.columns]
+    if 'player' in scorecard.columns and 'player_name' not in scorecard.columns:
+        scorecard = scorecard.rename(columns={'player': 'player_name'})
+    return scorecard
+
+def suggest_squad_names(scorecard, match_id):
+    """Suggest squad names for scorecard players outside the fixture squads, as {name: suggestion}"""
+    match_info = get_fixture(match_id)
+    if match_info is None or 'player_name' not in scorecard.columns:
+        return {}
+    
+    squad_teams = get_squad_teams(match_info['teams'])
+    suggestions = {}
+    for name in scorecard['player_name'].astype(str).str.strip().unique():
+        if name not in squad_teams:
+            suggestion = suggest_player_name(name, match_info['teams'])
+            if suggestion is not None:
+                suggestions[name] = suggestion
+    return suggestions
+
+def validate_scorecard(scorecard, match_id, confirmed_names=None):
+    """Validate scorecard rows against the fixture squads, returning (valid_rows, errors)"""
+    errors = []
+    match_info = get_fixture(match_id)
+    if match_info is None:
+        return pd.DataFrame(), [f"Unknown match {match_id}"]
+    
+    if 'player_name' not in scorecard.columns:
+        return pd.DataFrame(), ["Scorecard needs a player_name column"]
+    
+    # Player -> team for the two squads in this fixture
+    squad_teams = get_squad_teams(match_info['teams'])
+    
+    scorecard = scorecard.copy()
+    scorecard['player_name'] = scorecard['player_name'].astype(str).str.strip()
+    
+    # Names are only corrected where the admin accepted a suggest_squad_names
+    # suggestion, and only onto players in these two squads
+    confirmed = {name: squad_name for name, squad_name in (confirmed_names or {}).items() if squad_name in squad_teams}
+    scorecard['player_name'] = scorecard['player_name'].replace(confirmed)
+    scorecard['team_name'] = scorecard['player_name'].map(squad_teams)
+    
+    squads = f"the {match_info['teams'][0]} or {match_info['teams'][1]} squad"
+    for name in scorecard.loc[scorecard['team_name'].isna(), 'player_name']:
+        other_team = get_player_team(name)
+        if other_team:
+            errors.append(f"{name} plays for {other_team}, not {squads}")
+            continue
+        suggestion = suggest_player_name(name, match_info['teams'])
+        hint = f" (did you mean {suggestion}?)" if suggestion else ""
+        errors.append(f"{name} is not in {squads}{hint}")
+    
+    for name in scorecard.loc[scorecard['player_name'].duplicated(), 'player_name'].unique():
+        errors.append(f"{name} appears more than once")
+    
+    for column in SCORECARD_STAT_COLUMNS:
+        if column not in scorecard.columns:
+            scorecard[column] = 0
+            continue
+        values = pd.to_numeric(scorecard[column], errors='coerce')
+        for name in scorecard.loc[values.isna() & scorecard[column].notna(), 'player_name']:
+            errors.append(f"{name}: {column} is not a number")
+        for name in scorecard.loc[values < 0, 'player_name']:
+            errors.append(f"{name}: {column} cannot be negative")
+        scorecard[column] = values.fillna(0)
+    
+    if 'is_out' not in scorecard.columns:
+        scorecard['is_out'] = False
+    # Saved as a real bool so every scorer reads the same flag
+    is_out = scorecard['is_out'].map(parse_is_out)
+    for name, value in scorecard.loc[is_out.isna(), ['player_name', 'is_out']].itertuples(index=False):
+        errors.append(f"{name}: is_out must be yes/no or true/false, got {value!r}")
+    scorecard['is_out'] = is_out.fillna(False).astype(bool)
+    
+    valid = scorecard['team_name'].notna() & ~scorecard['player_name'].duplicated(keep=False) & is_out.notna()
+    for column in SCORECARD_STAT_COLUMNS:
+        valid &= scorecard[column] >= 0
+    
+    return scorecard[valid].reset_index(drop=True), errors
+
+def import_scorecard(match_id, source, fmt='csv', confirmed_names=None):
+    """Parse, validate, score and save a whole scorecard, returning (rows_saved, errors)"""
+    try:
+        scorecard = parse_scorecard(source, fmt)
+    except Exception as e:
+        return 0, [f"Could not read scorecard: {e}"]
+    
+    scorecard, errors = validate_scorecard(scorecard, match_id, confirmed_names)
+    if errors or scorecard.empty:
+        # All-or-nothing: a partial scorecard would leave teams half scored
+        return 0, errors or ["Scorecard has no rows"]
+    
+    scorecard['total_points'] = calculate_player_points_vectorized(scorecard)
+    if not save_performances_bulk(match_id, scorecard):
+        return 0, ["Error saving performances"]
+    
+    # One rescoring pass for the whole scorecard, off the caller's thread
+    request_rescore(match_id)
+    return len(scorecard), []
@@ -1,5 +1,7 @@
 import pandas as pd
+import numpy as np
 from utils.constants import CAPTAIN_MULTIPLIER, VICE_CAPTAIN_MULTIPLIER
+from utils.instrumentation import timed
 
 # Cricket Scoring System for 7-player format
 CRICKET_SCORING_SYSTEM = {
@@ -169,6 +171,99 @@ def calculate_total_player_points(performance_data):
     
     return total_points
 
+def _performance_column(performances, column):
+    """Get a numeric column from a performances DataFrame, zero when missing"""
+    if column not in performances.columns:
+        return np.zeros(len(performances))
+    return pd.to_numeric(performances[column], errors='coerce').fillna(0).to_numpy(dtype=float)
+
+# Accepted spellings of the is_out flag in scorecards and score updates
+IS_OUT_VALUES = {
+    'true': True, '1': True, '1.0': True, 'yes': True, 'y': True, 'out': True,
+    'false': False, '0': False, '0.0': False, 'no': False, 'n': False, 'not out': False, '': False
+}
+
+def parse_is_out(value):
+    """Get an is_out flag as a bool, False when blank, or None for an unknown value"""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return False
+    return IS_OUT_VALUES.get(str(value).strip().lower())
+
+def _is_out_column(performances):
+    """Get the is_out flags from a performances DataFrame as booleans"""
+    if 'is_out' not in performances.columns:
+        return np.zeros(len(performances), dtype=bool)
+    return performances['is_out'].map(lambda value: parse_is_out(value) is True).to_numpy(dtype=bool)
+
+@timed
+def calculate_player_points_vectorized(performances):
+    """Calculate total points for every row of a performances DataFrame in one pass"""
+    batting = CRICKET_SCORING_SYSTEM['batting']
+    bowling = CRICKET_SCORING_SYSTEM['bowling']
+    fielding = CRICKET_SCORING_SYSTEM['fielding']
+    strike_rate_points = CRICKET_SCORING_SYSTEM['strike_rate']
+    economy_points = CRICKET_SCORING_SYSTEM['economy_rate']
+    
+    runs = _performance_column(performances, 'runs')
+    balls_faced = _performance_column(performances, 'balls_faced')
+    wickets = _performance_column(performances, 'wickets')
+    overs_bowled = _performance_column(performances, 'overs_bowled')
+    runs_conceded = _performance_column(performances, 'runs_conceded')
+    catches = _performance_column(performances, 'catches')
+    is_out = _is_out_column(performances)
+    
+    # Batting: same thresholds and order as calculate_batting_points
+    points = runs * batting['run']
+    points += _performance_column(performances, 'fours') * batting['boundary']
+    points += _performance_column(performances, 'sixes') * batting['six']
+    points += np.select([runs >= 100, runs >= 50], [batting['century'], batting['fifty']], 0)
+    points += np.where(is_out & (runs == 0), batting['duck'], 0)
+    
+    strike_rate = np.divide(runs * 100, balls_faced, out=np.zeros_like(runs), where=balls_faced > 0)
+    points += np.where(balls_faced >= 10, np.select(
+        [strike_rate > 170, strike_rate >= 150, strike_rate >= 130, strike_rate <= 70, strike_rate <= 60, strike_rate < 50],
+        [strike_rate_points['above_170'], strike_rate_points['150_to_170'], strike_rate_points['130_to_150'],
+         strike_rate_points['60_to_70'], strike_rate_points['50_to_60'], strike_rate_points['below_50']],
+        0
+    ), 0)
+    
+    # Bowling: same thresholds and order as calculate_bowling_points
+    points += wickets * bowling['wicket']
+    points += np.select(
+        [wickets >= 5, wickets >= 4, wickets >= 3],
+        [bowling['five_wickets'], bowling['four_wickets'], bowling['three_wickets']],
+        0
+    )
+    points += _performance_column(performances, 'maidens') * bowling['maiden_over']
+    
+    economy_rate = np.divide(runs_conceded, overs_bowled, out=np.zeros_like(runs_conceded), where=overs_bowled > 0)
+    points += np.where(overs_bowled >= 2, np.select(
+        [economy_rate < 5, economy_rate < 6, economy_rate <= 7,
+         (economy_rate >= 10) & (economy_rate <= 11), (economy_rate > 11) & (economy_rate <= 12), economy_rate > 12],
+        [economy_points['below_5'], economy_points['5_to_599'], economy_points['6_to_7'],
+         economy_points['10_to_11'], economy_points['11_to_12'], economy_points['above_12']],
+        0
+    ), 0)
+    
+    # Fielding
+    points += catches * fielding['catch']
+    points += np.where(catches >= 3, fielding['three_catches'], 0)
+    points += _performance_column(performances, 'stumpings') * fielding['stumping']
+    points += _performance_column(performances, 'run_outs') * fielding['run_out_direct']
+    
+    # Playing 7 bonus
+    points += CRICKET_SCORING_SYSTEM['other']['playing_seven']
+    
+    return pd.Series(points, index=performances.index)
+
+def get_player_points(performance):
+    """Get a player's points from a saved performance record, as stored when it was scored"""
+    stored_points = performance.get('total_points')
+    if stored_points is None or pd.isna(stored_points):
+        # Players without a saved row (or rows saved without points) are scored here
+        return calculate_total_player_points(performance)
+    return float(stored_points)
+
 def calculate_team_points(team_players, performances, captain, vice_captain):
     """Calculate total points for a 7-player fantasy team"""
     total_points = 0
@@ -187,28 +282,148 @@ def calculate_team_points(team_players, performances, captain, vice_captain):
     
     return total_points
 
-def update_all_team_points(match_id):
-    """Update points for all teams after match completion"""
-    from utils.data_manager import get_all_teams, update_team_points, get_performances
+def build_scoring_index(teams_df):
+    """Build a sparse teams x players index with one (team, player, multiplier) entry per pick"""
+    team_ids = teams_df['team_id'].tolist()
+    player_names = sorted({player for players in teams_df['players'] for player in players.split(',')})
+    player_columns = {player: j for j, player in enumerate(player_names)}
+    player_teams = {player: [] for player in player_names}
     
-    # Get all performances for this match
-    match_performances = get_performances(match_id)
+    rows, columns, weights = [], [], []
+    for i, (players, captain, vice_captain) in enumerate(zip(teams_df['players'], teams_df['captain'], teams_df['vice_captain'])):
+        for player in players.split(','):
+            rows.append(i)
+            columns.append(player_columns[player])
+            player_teams[player].append(team_ids[i])
+            if player == captain:
+                weights.append(CRICKET_SCORING_SYSTEM['other']['captain_multiplier'])
+            elif player == vice_captain:
+                weights.append(CRICKET_SCORING_SYSTEM['other']['vice_captain_multiplier'])
+            else:
+                weights.append(1)
     
-    # Convert to dictionary for easier lookup
-    performances_dict = {}
-    for _, perf in match_performances.iterrows():
-        performances_dict[perf['player_name']] = perf.to_dict()
+    return {
+        'team_ids': team_ids,
+        'player_names': player_names,
+        'player_teams': player_teams,
+        'rows': np.array(rows, dtype=np.int64),
+        'columns': np.array(columns, dtype=np.int64),
+        'weights': np.array(weights, dtype=float)
+    }
+
+def score_teams(scoring_index, player_points):
+    """Total every team's points from per-player points (ordered as player_names)"""
+    contributions = scoring_index['weights'] * np.asarray(player_points, dtype=float)[scoring_index['columns']]
+    return np.bincount(scoring_index['rows'], weights=contributions, minlength=len(scoring_index['team_ids']))
+
+# Scoring indexes for matches whose entries are locked (built when a match goes
+# live), each with the teams/contests file versions it was checked against
+_match_scoring_indexes = {}
+
+def _get_match_teams(match_id):
+    """Get every team in contests on a match, or None when there are none"""
+    from utils.data_manager import get_all_teams, get_contests
     
-    # Get all teams
+    contests_df = get_contests()
     teams_df = get_all_teams()
+    if contests_df.empty or teams_df.empty:
+        return None
     
-    for _, team in teams_df.iterrows():
-        team_players = team['players'].split(',')
-        team_points = calculate_team_points(
-            team_players,
-            performances_dict,
-            team['captain'],
-            team['vice_captain']
-        )
-        
-        update_team_points(team['team_id'], team_points)
+    contest_ids = contests_df.loc[contests_df['match_id'] == match_id, 'contest_id']
+    return teams_df[teams_df['contest_id'].isin(contest_ids)]
+
+def _scoring_inputs_version():
+    """Get the change marker for the files a match scoring index is built from"""
+    from utils.data_store import file_version
+    
+    return (file_version('teams'), file_version('contests'))
+
+@timed
+def build_match_scoring_index(match_id):
+    """Build the scoring index for every team in contests on a match"""
+    match_teams = _get_match_teams(match_id)
+    return None if match_teams is None else build_scoring_index(match_teams)
+
+def cache_match_scoring_index(match_id):
+    """Build and keep the scoring index for a match whose entries are locked"""
+    version = _scoring_inputs_version()
+    scoring_index = build_match_scoring_index(match_id)
+    if scoring_index is not None:
+        _match_scoring_indexes[match_id] = {'version': version, 'index': scoring_index}
+    return scoring_index
+
+def get_match_scoring_index(match_id):
+    """Get the cached scoring index for a locked match, or build a fresh one"""
+    cached = _match_scoring_indexes.get(match_id)
+    if cached is None:
+        return build_match_scoring_index(match_id)
+    
+    version = _scoring_inputs_version()
+    if cached['version'] != version or None in version:
+        # Points updates also rewrite teams.csv, so only rebuild when the match's entries changed
+        match_teams = _get_match_teams(match_id)
+        team_ids = [] if match_teams is None else match_teams['team_id'].tolist()
+        if team_ids != cached['index']['team_ids']:
+            if match_teams is None:
+                _match_scoring_indexes.pop(match_id, None)
+                return None
+            cached['index'] = build_scoring_index(match_teams)
+        cached['version'] = version
+    return cached['index']
+
+def drop_match_scoring_index(match_id):
+    """Forget the cached scoring index for a match"""
+    _match_scoring_indexes.pop(match_id, None)
+
+@timed
+def update_all_team_points(match_id):
+    """Update points for all teams in contests on a match"""
+    from utils.data_manager import get_match_performance_map, update_team_points_bulk
+    from utils.snapshots import record_match_snapshots
+    
+    # Player name -> performance record for this match
+    performances_dict = get_match_performance_map(match_id)
+    
+    # Only teams in contests on this match score from its performances
+    scoring_index = get_match_scoring_index(match_id)
+    if scoring_index is None or not scoring_index['team_ids']:
+        return True
+    
+    # Look up each picked player's saved points once, then total every team in one sparse pass
+    player_points = [
+        get_player_points(performances_dict.get(player, {})) for player in scoring_index['player_names']
+    ]
+    team_points = dict(zip(scoring_index['team_ids'], score_teams(scoring_index, player_points)))
+    
+    # Apply every team's new total in one write
+    if not update_team_points_bulk(team_points, match_id):
+        return False
+    
+    # Keep leaderboard history for rank-movement views
+    record_match_snapshots(match_id)
+    return True
+
+@timed
+def get_team_breakdown(players, captain, vice_captain, match_id):
+    """Get per-player points for one team from the match's saved performances"""
+    from utils.data_manager import get_match_performance_map
+    
+    performances_dict = get_match_performance_map(match_id)
+    breakdown = []
+    for player in players:
+        base_points = get_player_points(performances_dict.get(player, {}))
+        if player == captain:
+            role, multiplier = 'Captain', CRICKET_SCORING_SYSTEM['other']['captain_multiplier']
+        elif player == vice_captain:
+            role, multiplier = 'Vice-Captain', CRICKET_SCORING_SYSTEM['other']['vice_captain_multiplier']
+        else:
+            role, multiplier = '', 1
+        breakdown.append({
+            'Player': player,
+            'Role': role,
+            'Played': player in performances_dict,
+            'Base Points': base_points,
+            'Multiplier': multiplier,
+            'Points': base_points * multiplier
+        })
+    return pd.DataFrame(breakdown)
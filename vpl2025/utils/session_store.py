@@ -0,0 +1,109 @@
+import os
+import json
+import hmac
+import hashlib
+import secrets
+import time
+
+# Optional shared login sessions so any Streamlit replica can restore a user.
+# Enabled by setting VPL_SESSION_SECRET (the same value on every replica).
+# A session is a small JSON file in data/sessions/, keyed by a random id; the
+# client holds "<session_id>.<signature>" in the vpl_session cookie (never in
+# the URL, where it would leak through shared links, history and logs), and
+# the HMAC signature lets replicas reject forged tokens without touching the disk.
+SESSION_DIR = 'data/sessions'
+SESSION_SECRET = os.environ.get('VPL_SESSION_SECRET')
+SESSION_TTL_SECONDS = int(os.environ.get('VPL_SESSION_TTL_SECONDS', 7 * 24 * 3600))
+SESSION_COOKIE = 'vpl_session'
+
+def is_enabled():
+    """Check whether shared sessions are configured"""
+    return bool(SESSION_SECRET)
+
+def _sign(session_id):
+    """Sign a session id with the shared secret"""
+    return hmac.new(SESSION_SECRET.encode(), session_id.encode(), hashlib.sha256).hexdigest()
+
+def _session_id(token):
+    """Get the session id from a token, or None if the signature does not match"""
+    if not is_enabled() or not token or '.' not in token:
+        return None
+    session_id, signature = token.rsplit('.', 1)
+    if not hmac.compare_digest(_sign(session_id), signature):
+        return None
+    return session_id
+
+def _session_path(session_id):
+    """Get the file for a session"""
+    return os.path.join(SESSION_DIR, f"{session_id}.json")
+
+def create_session(user_id, username, is_admin):
+    """Store a new session for a user and return its signed token"""
+    if not is_enabled():
+        return None
+    os.makedirs(SESSION_DIR, exist_ok=True)
+    session_id = secrets.token_urlsafe(24)
+    now = time.time()
+    session = {
+        'user_id': user_id,
+        'username': username,
+        'is_admin': bool(is_admin),
+        'created_at': now,
+        'expires_at': now + SESSION_TTL_SECONDS
+    }
+    
+    temp_path = f"{_session_path(session_id)}.{os.getpid()}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(session, f)
+    os.replace(temp_path, _session_path(session_id))
+    return f"{session_id}.{_sign(session_id)}"
+
+def get_session(token):
+    """Get the live session for a token, or None if it is invalid or expired"""
+    session_id = _session_id(token)
+    if session_id is None:
+        return None
+    try:
+        with open(_session_path(session_id)) as f:
+            session = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if session['expires_at'] < time.time():
+        delete_session(token)
+        return None
+    return session
+
+def delete_session(token):
+    """Remove a session so its token stops working on every replica"""
+    session_id = _session_id(token)
+    if session_id is None:
+        return False
+    try:
+        os.remove(_session_path(session_id))
+        return True
+    except OSError:
+        return False
+
+def purge_expired_sessions():
+    """Delete expired session files, returning how many were removed"""
+    if not os.path.isdir(SESSION_DIR):
+        return 0
+    removed = 0
+    now = time.time()
+    for name in os.listdir(SESSION_DIR):
+        if not name.endswith('.json'):
+            continue
+        path = os.path.join(SESSION_DIR, name)
+        try:
+            with open(path) as f:
+                expired = json.load(f)['expires_at'] < now
+        except (OSError, ValueError, KeyError):
+            expired = True
+        if expired:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+    return removed
@@ -0,0 +1,208 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# Leaderboard history is stored per contest as an append-only binary log.
+# Each record is a header (number of entries, keyframe flag, unix timestamp)
+# followed by int32 team indices and int32 points. Keyframes hold every team,
+# other records hold only the teams whose points changed since the last one.
+SNAPSHOT_DIR = 'data/snapshots'
+POINTS_SCALE = 10  # Points stored as int32 tenths (captain/vice-captain give fractions)
+KEYFRAME_INTERVAL = 50  # Full snapshot every N records keeps replay short
+
+# Last captured state per contest: team order, team_id -> index and points
+_snapshot_state = {}
+
+def _snapshot_paths(contest_id):
+    """Get the log and team index file paths for a contest"""
+    return (
+        os.path.join(SNAPSHOT_DIR, f"{contest_id}.snap"),
+        os.path.join(SNAPSHOT_DIR, f"{contest_id}.teams")
+    )
+
+def _read_team_ids(contest_id):
+    """Read the team index order for a contest"""
+    _, teams_path = _snapshot_paths(contest_id)
+    if not os.path.exists(teams_path):
+        return []
+    with open(teams_path) as f:
+        return [line.strip() for line in f if line.strip()]
+
+def _iter_records(contest_id):
+    """Yield (timestamp, is_keyframe, indices, points) for each stored snapshot"""
+    snap_path, _ = _snapshot_paths(contest_id)
+    if not os.path.exists(snap_path):
+        return
+    
+    # Stream one record at a time so replay memory stays at one snapshot
+    with open(snap_path, 'rb') as f:
+        while True:
+            header = f.read(3 * 8)
+            if len(header) < 3 * 8:
+                break
+            count, is_keyframe, timestamp = np.frombuffer(header, dtype=np.int64)
+            indices = np.frombuffer(f.read(int(count) * 4), dtype=np.int32)
+            points = np.frombuffer(f.read(int(count) * 4), dtype=np.int32)
+            yield int(timestamp), bool(is_keyframe), indices, points
+
+def _load_state(contest_id):
+    """Get the last captured state for a contest, replaying the log after a restart"""
+    if contest_id not in _snapshot_state:
+        team_ids = _read_team_ids(contest_id)
+        points = np.zeros(len(team_ids), dtype=np.int32)
+        record_count = 0
+        since_keyframe = 0
+        for _, is_keyframe, indices, values in _iter_records(contest_id):
+            points[indices] = values
+            record_count += 1
+            since_keyframe = 0 if is_keyframe else since_keyframe + 1
+        
+        _snapshot_state[contest_id] = {
+            'team_ids': team_ids,
+            'index': {team_id: i for i, team_id in enumerate(team_ids)},
+            'points': points,
+            'records': record_count,
+            'since_keyframe': since_keyframe
+        }
+    return _snapshot_state[contest_id]
+
+def capture_snapshot(contest_id, team_ids, points):
+    """Append a leaderboard snapshot for a contest, storing only changed teams"""
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        state = _load_state(contest_id)
+        snap_path, teams_path = _snapshot_paths(contest_id)
+        
+        # Register teams that joined since the last snapshot
+        new_team_ids = [team_id for team_id in team_ids if team_id not in state['index']]
+        first_new_index = len(state['team_ids'])
+        if new_team_ids:
+            with open(teams_path, 'a') as f:
+                for team_id in new_team_ids:
+                    state['index'][team_id] = len(state['team_ids'])
+                    state['team_ids'].append(team_id)
+                    f.write(f"{team_id}\n")
+            state['points'] = np.concatenate([state['points'], np.zeros(len(new_team_ids), dtype=np.int32)])
+        
+        current = state['points'].copy()
+        indices = np.fromiter((state['index'][team_id] for team_id in team_ids), dtype=np.int32, count=len(team_ids))
+        current[indices] = np.round(np.asarray(points, dtype=float) * POINTS_SCALE).astype(np.int32)
+        
+        is_keyframe = state['records'] == 0 or state['since_keyframe'] + 1 >= KEYFRAME_INTERVAL
+        if is_keyframe:
+            changed = np.arange(len(current), dtype=np.int32)
+        else:
+            # New teams are always written, even at 0 points, so replay sees them join here
+            changed = np.flatnonzero(current != state['points'])
+            changed = np.union1d(changed, np.arange(first_new_index, len(current))).astype(np.int32)
+        
+        header = np.array([len(changed), int(is_keyframe), int(time.time())], dtype=np.int64)
+        with open(snap_path, 'ab') as f:
+            f.write(header.tobytes())
+            f.write(changed.tobytes())
+            f.write(current[changed].tobytes())
+        
+        state['points'] = current
+        state['records'] += 1
+        state['since_keyframe'] = 0 if is_keyframe else state['since_keyframe'] + 1
+        return state['records'] - 1
+    except Exception as e:
+        print(f"Error capturing snapshot: {e}")
+        return None
+
+def record_match_snapshots(match_id):
+    """Capture a snapshot of every contest on a match after a scoring batch"""
+    from utils.data_manager import get_contests, get_all_teams
+    
+    contests_df = get_contests()
+    if contests_df.empty:
+        return
+    
+    contest_ids = contests_df.loc[contests_df['match_id'] == match_id, 'contest_id'].tolist()
+    teams_df = get_all_teams()
+    if teams_df.empty or not contest_ids:
+        return
+    
+    match_teams = teams_df[teams_df['contest_id'].isin(contest_ids)]
+    for contest_id, contest_teams in match_teams.groupby('contest_id'):
+        capture_snapshot(contest_id, contest_teams['team_id'].tolist(), contest_teams['total_points'].to_numpy())
+
+def get_snapshot_count(contest_id):
+    """Get the number of snapshots stored for a contest"""
+    return _load_state(contest_id)['records']
+
+def _iter_states(contest_id):
+    """Yield (timestamp, points array) for every snapshot in order"""
+    points = np.zeros(len(_read_team_ids(contest_id)), dtype=np.int32)
+    active_teams = 0
+    for timestamp, _, indices, values in _iter_records(contest_id):
+        points[indices] = values
+        # Teams are indexed in join order, so later joiners sit at the end
+        if len(indices):
+            active_teams = max(active_teams, int(indices.max()) + 1)
+        yield timestamp, points[:active_teams]
+
+def _ranks(points):
+    """Rank points descending, tied teams sharing the best rank"""
+    sorted_points = np.sort(points)
+    return len(points) - np.searchsorted(sorted_points, points, side='right') + 1
+
+def get_standings_at(contest_id, snapshot_no):
+    """Reconstruct the standings of a contest as of a given snapshot"""
+    team_ids = _read_team_ids(contest_id)
+    for i, (timestamp, points) in enumerate(_iter_states(contest_id)):
+        if i == snapshot_no:
+            standings = pd.DataFrame({
+                'team_id': team_ids[:len(points)],
+                'total_points': points / POINTS_SCALE,
+                'rank': _ranks(points)
+            })
+            standings['captured_at'] = pd.to_datetime(timestamp, unit='s')
+            return standings.sort_values('rank', kind='stable').reset_index(drop=True)
+    return pd.DataFrame(columns=['team_id', 'total_points', 'rank', 'captured_at'])
+
+def get_rank_history(contest_id, team_id):
+    """Get a team's rank and points at every snapshot of a contest"""
+    team_ids = _read_team_ids(contest_id)
+    if team_id not in team_ids:
+        return pd.DataFrame(columns=['snapshot', 'captured_at', 'rank', 'total_points'])
+    team_index = team_ids.index(team_id)
+    
+    history = []
+    for i, (timestamp, points) in enumerate(_iter_states(contest_id)):
+        if team_index >= len(points):
+            continue  # Team had not joined yet
+        team_points = points[team_index]
+        history.append({
+            'snapshot': i,
+            'captured_at': pd.to_datetime(timestamp, unit='s'),
+            'rank': int(np.count_nonzero(points > team_points)) + 1,
+            'total_points': team_points / POINTS_SCALE
+        })
+    return pd.DataFrame(history)
+
+def get_biggest_climbers(contest_id, top_n=5, from_snapshot=0, to_snapshot=None):
+    """Get the teams that gained the most places between two snapshots"""
+    team_ids = _read_team_ids(contest_id)
+    start_ranks = None
+    end_ranks = None
+    for i, (_, points) in enumerate(_iter_states(contest_id)):
+        if i == from_snapshot:
+            start_ranks = _ranks(points)
+        end_ranks = _ranks(points)
+        if to_snapshot is not None and i == to_snapshot:
+            break
+    
+    if start_ranks is None or end_ranks is None:
+        return pd.DataFrame(columns=['team_id', 'start_rank', 'end_rank', 'places_gained'])
+    
+    # Teams that joined after the start snapshot have no starting position
+    start_ranks = start_ranks[:len(end_ranks)]
+    movement = pd.DataFrame({
+        'team_id': team_ids[:len(start_ranks)],
+        'start_rank': start_ranks,
+        'end_rank': end_ranks[:len(start_ranks)]
+    })
+    movement['places_gained'] = movement['start_rank'] - movement['end_rank']
+    return movement.nlargest(top_n, 'places_gained').reset_index(drop=True)
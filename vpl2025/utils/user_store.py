@@ -0,0 +1,105 @@
+import threading
+import pandas as pd
+from utils.data_store import table_columns, file_version, read_table, write_table, append_table, read_appended
+
+# Users live in data/users.csv. Each process keeps unique indexes by user_id,
+# username and email, so login and registration are dictionary lookups. New
+# users are appended to the file rather than rewriting it, and appends made by
+# other processes are picked up by reading only the bytes past the last load.
+# A reload builds a fresh set of indexes and swaps it in with one assignment,
+# so lookups never see a half-built index.
+USER_COLUMNS = table_columns('users')
+
+def _empty_index(version=None):
+    """Get an empty set of user indexes for a users file version"""
+    return {'version': version, 'by_id': {}, 'by_username': {}, 'by_email': {}}
+
+_user_state = {'index': _empty_index()}
+_index_lock = threading.Lock()
+_write_lock = threading.Lock()
+
+def _normalize_email(email):
+    """Normalize an email address for the email index"""
+    return str(email).strip().lower()
+
+def _index_users(index, users):
+    """Add user records to a set of indexes"""
+    for user in users:
+        index['by_id'][user['user_id']] = user
+        index['by_username'][user['username']] = user
+        if isinstance(user.get('email'), str) and user['email']:
+            index['by_email'][_normalize_email(user['email'])] = user
+
+def _user_records(users_df):
+    """Get user records from rows of the users table"""
+    users_df['username'] = users_df['username'].astype(str)
+    return users_df.to_dict('records')
+
+def _load_index():
+    """Bring the indexes up to date with the users file"""
+    with _index_lock:
+        current = _user_state['index']
+        version = file_version('users')
+        if version is not None and current['version'] == version:
+            return current
+        
+        index = _empty_index(version)
+        appended = read_appended('users', current['version'], version)
+        if appended is not None:
+            # Only rows were appended since the last load, read just those
+            for key in ('by_id', 'by_username', 'by_email'):
+                index[key] = dict(current[key])
+            _index_users(index, _user_records(appended))
+        elif version is not None:
+            # First load, or the file was replaced (e.g. by update_user in any process)
+            _index_users(index, _user_records(read_table('users')))
+        
+        _user_state['index'] = index
+        return index
+
+def get_user(user_id):
+    """Get a user record by user_id"""
+    return _load_index()['by_id'].get(user_id)
+
+def get_user_by_username(username):
+    """Get a user record by username"""
+    return _load_index()['by_username'].get(username)
+
+def get_user_by_email(email):
+    """Get a user record by email address"""
+    return _load_index()['by_email'].get(_normalize_email(email))
+
+def get_user_count():
+    """Get the number of registered users"""
+    return len(_load_index()['by_id'])
+
+def insert_user(user):
+    """Append a new user, returning False if the username or email is already taken"""
+    with _write_lock:
+        index = _load_index()
+        if user['username'] in index['by_username']:
+            return False
+        if user.get('email') and _normalize_email(user['email']) in index['by_email']:
+            return False
+        
+        append_table('users', pd.DataFrame([user], columns=USER_COLUMNS))
+        
+        # The tail read picks up this row along with any other process's appends
+        _load_index()
+        return True
+
+def update_user(user_id, **changes):
+    """Rewrite a user's row with changed fields, returning False if the user is unknown"""
+    with _write_lock:
+        if user_id not in _load_index()['by_id']:
+            return False
+        
+        users_df = read_table('users')
+        user_mask = users_df['user_id'] == user_id
+        for key, value in changes.items():
+            users_df.loc[user_mask, key] = value
+        
+        # Rare path (password upgrades), so a whole-file atomic rewrite is fine
+        write_table('users', users_df)
+        _load_index()
+        return True